@@ -0,0 +1,57 @@
+"""
+Bar geometry module for the Insertion Sort Visualizer.
+A sort only permutes its values, so the slot of every index and the
+height of every value are fixed for a whole run. They are tabulated once
+per data set and canvas size, and drawing a frame is only lookups.
+"""
+
+PADDING = 20  # left and right
+BAR_SPACING = 2
+MIN_BAR_WIDTH = 2
+TOP_MARGIN = 60  # space for text
+BOTTOM_MARGIN = 20
+
+
+class BarGeometry:
+    """
+    Slot x-coordinates per index and top y-coordinates per value.
+
+    fraction maps a value to its bar height as a fraction of the
+    drawable height; scale identifies it (e.g. the largest value), so
+    key tells which data set and canvas size the table is for.
+    """
+    def __init__(self, values, width, height, fraction, scale=None):
+        n = len(values)
+        self.key = (n, width, height, scale)
+        self.scale = scale
+        self.fraction = fraction
+        self.slot_width = (width - 2 * PADDING) / n
+        bar_width = max(MIN_BAR_WIDTH, self.slot_width - BAR_SPACING)
+        self.x0 = [PADDING + i * self.slot_width for i in range(n)]
+        self.x1 = [x + bar_width for x in self.x0]
+        self.centers = [x + bar_width / 2 for x in self.x0]
+        self.y0 = height - BOTTOM_MARGIN
+        self.available_height = height - TOP_MARGIN - BOTTOM_MARGIN
+        self.tops = {}
+        for value in set(values):
+            self.add(value)
+
+    # Add
+    def add(self, value):
+        """
+        Tabulate a value that was not in the data set; returns its top.
+        """
+        top = self.y0 - self.fraction(value) * self.available_height
+        self.tops[value] = top
+        return top
+
+    # Lookups
+    def top(self, value):
+        top = self.tops.get(value)
+        return self.add(value) if top is None else top
+
+    def label_y(self, value):
+        return max(TOP_MARGIN, self.top(value) - 10)
+
+    def step_label_y(self, value):
+        return max(TOP_MARGIN + 20, self.top(value) - 30)
@@ -0,0 +1,245 @@
+"""
+Batch module for the Insertion Sort Visualizer.
+Analyzes many arrays on a process pool and streams one JSON line per
+array to an output file, followed by summary histograms.
+
+    python -m headless --batch --file arrays.txt --output results.jsonl
+    python -m headless --batch --generate random:10000:200:7 --workers 8
+"""
+
+import itertools
+import json
+import os
+import random
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from headless import analyze, parse_array
+
+GENERATOR_KINDS = ('random', 'nearly', 'reversed', 'sorted')
+HISTOGRAM_BINS = 10
+RESERVOIR_SIZE = 10000  # values kept per histogram; exact up to this many arrays
+
+
+# Generate
+def generate_arrays(spec):
+    """
+    Arrays described by kind:count:size[:seed], e.g. random:1000:100:42.
+    """
+    parts = spec.split(':')
+    if len(parts) not in (3, 4) or parts[0] not in GENERATOR_KINDS:
+        raise ValueError(f"Invalid generator spec '{spec}', expected kind:count:size[:seed] "
+                         f"with kind one of {', '.join(GENERATOR_KINDS)}")
+    kind = parts[0]
+    count, size = int(parts[1]), int(parts[2])
+    rng = random.Random(int(parts[3]) if len(parts) == 4 else None)
+    for _ in range(count):
+        data = [rng.randint(1, 100) for _ in range(size)]
+        if kind == 'sorted':
+            data.sort()
+        elif kind == 'reversed':
+            data.sort(reverse=True)
+        elif kind == 'nearly':
+            data.sort()
+            for _ in range(max(1, size // 10) if size > 1 else 0):
+                k = rng.randrange(size - 1)
+                data[k], data[k + 1] = data[k + 1], data[k]
+        yield data
+
+
+# Read
+def iter_arrays(args, stdin=None):
+    """
+    Lazily yield arrays from the positional arguments, --file, stdin and
+    --generate specs, so huge inputs never sit in memory at once.
+    """
+    stdin = sys.stdin if stdin is None else stdin
+    sources = [s for s in args.arrays if s != '-']
+    for source in sources:
+        yield parse_array(source)
+    if args.file:
+        with open(args.file, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip() and not line.startswith('#'):
+                    yield parse_array(line)
+    if '-' in args.arrays or (not args.arrays and not args.file
+                              and not args.generate and not stdin.isatty()):
+        for line in stdin:
+            if line.strip() and not line.startswith('#'):
+                yield parse_array(line)
+    for spec in args.generate or ():
+        yield from generate_arrays(spec)
+
+
+# Chunk
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# Worker
+def analyze_chunk(arrays, variant='insertion'):
+    """
+    Statistics for a chunk of arrays; runs in a pool process.
+    """
+    results = []
+    for data in arrays:
+        stats = analyze(data, variant)
+        n = stats['length']
+        max_shifts = n * (n - 1) // 2
+        # 0.0 for sorted input, 1.0 for reversed input
+        stats['disorder'] = stats['shifts'] / max_shifts if max_shifts else 0.0
+        results.append(stats)
+    return results
+
+
+# Analyze
+def run_batch(arrays, variant='insertion', chunk_size=256, max_workers=None, pool=None):
+    """
+    Yield per-array statistics in input order. At most two chunks per
+    worker are in flight, so results stream while input is still read.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    owned = pool is None
+    if owned:
+        pool = ProcessPoolExecutor(max_workers=workers)
+    limit = 2 * workers
+    pending = deque()
+    try:
+        for chunk in chunked(arrays, chunk_size):
+            pending.append(pool.submit(analyze_chunk, chunk, variant))
+            if len(pending) >= limit:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if owned:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+class ValueSample:
+    """
+    Count and range of a stream of values, with a uniform sample of at
+    most size of them (reservoir sampling), so memory stays bounded.
+    """
+    def __init__(self, size=RESERVOIR_SIZE, seed=0):
+        self.size = size
+        self.count = 0
+        self.low = None
+        self.high = None
+        self.values = []
+        self._rng = random.Random(seed)
+
+    # Add
+    def add(self, value):
+        self.count += 1
+        if self.low is None or value < self.low:
+            self.low = value
+        if self.high is None or value > self.high:
+            self.high = value
+        if len(self.values) < self.size:
+            self.values.append(value)
+        else:
+            k = self._rng.randrange(self.count)
+            if k < self.size:
+                self.values[k] = value
+
+
+class BatchSummary:
+    """
+    Running totals and histograms over the streamed results.
+    """
+    def __init__(self, bins=HISTOGRAM_BINS, sample_size=RESERVOIR_SIZE):
+        self.bins = bins
+        self.count = 0
+        self.comparisons = ValueSample(sample_size)
+        self.shifts = ValueSample(sample_size)
+        self.disorder_counts = [0] * bins
+
+    # Add
+    def add(self, stats):
+        self.count += 1
+        self.comparisons.add(stats['comparisons'])
+        self.shifts.add(stats['shifts'])
+        index = min(int(stats['disorder'] * self.bins), self.bins - 1)
+        self.disorder_counts[index] += 1
+
+    # Histogram
+    def histogram(self, sample):
+        """
+        (low, high, count) buckets of equal width over the sampled values.
+        Counts are exact while every value fits the sample and scaled up
+        from it afterwards.
+        """
+        if not sample.count:
+            return []
+        low, high = sample.low, sample.high
+        width = max(1, -(-(high - low + 1) // self.bins))
+        counts = [0] * self.bins
+        for value in sample.values:
+            counts[min((value - low) // width, self.bins - 1)] += 1
+        factor = sample.count / len(sample.values)
+        return [(low + k * width, low + (k + 1) * width - 1, round(c * factor))
+                for k, c in enumerate(counts) if low + k * width <= high]
+
+    def to_dict(self):
+        return {
+            'arrays': self.count,
+            'comparisons': self.histogram(self.comparisons),
+            'shifts': self.histogram(self.shifts),
+            'disorder': [(k / self.bins, (k + 1) / self.bins, c)
+                         for k, c in enumerate(self.disorder_counts)],
+        }
+
+    # Text
+    def format(self, width=40):
+        lines = [f"Arrays analyzed: {self.count}"]
+        sections = [("Comparisons", self.histogram(self.comparisons), "{:>8}-{:<8}"),
+                    ("Shifts", self.histogram(self.shifts), "{:>8}-{:<8}"),
+                    ("Disorder (shifts / max shifts)", self.to_dict()['disorder'], "{:>8.1f}-{:<8.1f}")]
+        for title, buckets, label in sections:
+            lines.append("")
+            lines.append(title)
+            peak = max((c for _, _, c in buckets), default=0) or 1
+            for low, high, c in buckets:
+                lines.append(f"{label.format(low, high)} {'#' * round(c / peak * width):<{width}} {c}")
+        return "\n".join(lines)
+
+
+# Run
+def run(args, out=None):
+    """
+    Batch mode of the headless CLI; returns an exit code.
+    """
+    out = sys.stdout if out is None else out
+    summary = BatchSummary()
+    output = None
+    try:
+        output = open(args.output, 'w', encoding='utf-8') if args.output else out
+        for stats in run_batch(iter_arrays(args), args.algorithm,
+                               args.chunk_size, args.workers):
+            summary.add(stats)
+            output.write(json.dumps(stats) + "\n")
+    except (OSError, ValueError) as e:
+        print(f"Error in batch analysis: {str(e)}", file=sys.stderr)
+        return 2
+    finally:
+        if output is not None and output is not out:
+            output.close()
+    if not summary.count:
+        print("No arrays given", file=sys.stderr)
+        return 2
+    # Keep stdout machine readable when results go there
+    report = sys.stderr if not args.output else out
+    if args.json:
+        json.dump(summary.to_dict(), report, indent=2)
+        report.write("\n")
+    else:
+        print(summary.format(), file=report)
+    return 0
@@ -3,38 +3,7 @@ from tkinter import ttk
 from PIL import Image, ImageTk
 import os
 import math # Not strictly needed for this change, but keeping for flap disc if used
-
-class RoundedRectangleCanvas(tk.Canvas):
-    """
-    A custom Canvas widget that draws a rounded rectangle as its background.
-    Useful for creating UI elements with rounded corners.
-    """
-    def __init__(self, parent, corner_radius, fill_color, **kwargs):
-        # Set the canvas background to match the fill_color for a consistent look.
-        # This is crucial for ensuring the entire area of the custom canvas matches its intended color.
-        super().__init__(parent, highlightthickness=0, bg=fill_color, **kwargs)
-        self.corner_radius = corner_radius
-        self.fill_color = fill_color # This is used for the polygon fill
-        self.bind("<Configure>", self._draw_rounded_rectangle)
-
-    def _draw_rounded_rectangle(self, event=None):
-        self.delete("rect") # Clear previous drawing
-        width = self.winfo_width()
-        height = self.winfo_height()
-
-        # Define points for the rounded rectangle
-        points = [self.corner_radius, 0,
-                  width - self.corner_radius, 0,
-                  width, self.corner_radius,
-                  width, height - self.corner_radius,
-                  width - self.corner_radius, height,
-                  self.corner_radius, height,
-                  0, height - self.corner_radius,
-                  0, self.corner_radius]
-
-        self.create_polygon(points, smooth=True, fill=self.fill_color, tags="rect")
-        self.tag_lower("rect") # Ensure other widgets placed on canvas are on top
-
+from rounded_canvas import RoundedRectangleCanvas
 
 class App:
     def __init__(self, root):
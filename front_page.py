@@ -1,3 +1,4 @@
+from launch_timer import LaunchTimer, requested as launch_report_requested
 import tkinter as tk
 from tkinter import ttk, messagebox
 from PIL import Image, ImageTk
@@ -6,48 +7,11 @@ import math
 import subprocess
 import sys
 
-class RoundedRectangleCanvas(tk.Canvas):
-    # Inits
-    def __init__(self, parent, corner_radius, fill_color, border_color=None, border_width=0, **kwargs):
-        super().__init__(parent, highlightthickness=0, bg=fill_color, **kwargs)
-        self.corner_radius = corner_radius
-        self.fill_color = fill_color
-        self.border_color = border_color
-        self.border_width = border_width
-        self.bind("<Configure>", self._draw_rounded_rectangle)
-
-    # Draw shape
-    def _draw_rounded_rectangle(self, event=None):
-        self.delete("rect")
-        width = self.winfo_width()
-        height = self.winfo_height()
-        points = [self.corner_radius, 0,
-                  width - self.corner_radius, 0,
-                  width, self.corner_radius,
-                  width, height - self.corner_radius,
-                  width - self.corner_radius, height,
-                  self.corner_radius, height,
-                  0, height - self.corner_radius,
-                  0, self.corner_radius]
-        if self.border_color and self.border_width > 0:
-            self.create_polygon(points, smooth=True, fill=self.border_color, tags="border")
-            self.tag_lower("border")
-            shrink = self.border_width
-            points = [self.corner_radius + shrink, shrink,
-                      width - self.corner_radius - shrink, shrink,
-                      width - shrink, self.corner_radius + shrink,
-                      width - shrink, height - self.corner_radius - shrink,
-                      width - self.corner_radius - shrink, height - shrink,
-                      self.corner_radius + shrink, height - shrink,
-                      shrink, height - self.corner_radius - shrink,
-                      shrink, self.corner_radius + shrink]
-        self.create_polygon(points, smooth=True, fill=self.fill_color, tags="rect")
-        self.tag_lower("rect")
-
 class App:
     # Init
-    def __init__(self, root):
+    def __init__(self, root, launch=None):
         self.root = root
+        self.launch = launch or LaunchTimer()
         self.root.title("Sorting Visualizer")
         self.root.state('zoomed')
         self.root.attributes('-fullscreen', True)
@@ -86,8 +50,6 @@ class App:
         self.right_panel.pack(side="left", padx=(0, 0), pady=0)
         self.right_panel.pack_propagate(False)
         self.right_panel.config(relief="ridge")
-        self.right_panel.after(10, lambda: self.right_panel.config(highlightbackground=border_color))
-        self.right_panel.update()
         self.right_panel_canvas = tk.Canvas(self.right_panel, width=panel_width, height=panel_height, bg=panel_color, highlightthickness=0, bd=0)
         self.right_panel_canvas.place(x=0, y=0, relwidth=1, relheight=1)
         self.right_panel_canvas.create_rectangle(8, 8, panel_width-8, panel_height-8, outline=border_color, width=2, fill=panel_color)
@@ -101,6 +63,7 @@ class App:
         self.exit_btn.bind("<Button-1>", lambda e: self.root.destroy())
         self.exit_btn.bind("<Enter>", lambda e: self.exit_btn.itemconfig(self.exit_oval, outline="#C9302C"))
         self.exit_btn.bind("<Leave>", lambda e: self.exit_btn.itemconfig(self.exit_oval, outline="#fff"))
+        self.panel_color = panel_color
         right_content = tk.Frame(self.right_panel, bg=panel_color)
         right_content.place(relx=0, rely=0, relwidth=1, relheight=1)
         subtitle = tk.Label(
@@ -120,17 +83,10 @@ class App:
             text="Developers:", font=("Arial", 10, "bold"), fg="#bfc7d5", bg=panel_color
         )
         dev_label.pack(anchor="w", padx=30)
-        devs = [
-            "• Joson, Ivan",
-            "• Mamorno, Joshua",
-            "• Miano, Mike Jester",
-            "• Pilar, Mark Aljon",
-            "• Santos, Dave Ulrich",
-            "• Toledana, Cedrick"
-        ]
-        for dev in devs:
-            tk.Label(right_content, text=dev, font=("Arial", 10), fg="#e0e6f0", bg=panel_color).pack(anchor="w", padx=48, pady=0)
-        tk.Label(right_content, bg=panel_color).pack(pady=8)
+        self.right_content = right_content
+        # The developer list is filled in after the first paint
+        self.dev_spacer = tk.Label(right_content, bg=panel_color)
+        self.dev_spacer.pack(pady=8)
         self.go_sort_button = tk.Button(
             right_content,
             text="Go sort",
@@ -144,6 +100,8 @@ class App:
         self.go_sort_button.pack(pady=(0, 0), ipadx=60, ipady=12, anchor="center")
         self.go_sort_button.bind("<Enter>", lambda e: self.go_sort_button.config(bg="#33CCFF"))
         self.go_sort_button.bind("<Leave>", lambda e: self.go_sort_button.config(bg="#232334"))
+        self.go_sort_button.bind("<Expose>", self.on_first_paint, add="+")
+        self.root.bind_all("<ButtonPress>", self.on_first_click, add="+")
         self.left_panel = tk.Frame(
             self.center_frame, width=panel_width, height=panel_height,
             bg=panel_color, highlightbackground=border_color, highlightthickness=2, bd=0
@@ -151,8 +109,6 @@ class App:
         self.left_panel.pack(side="left", padx=(0, gap), pady=0)
         self.left_panel.pack_propagate(False)
         self.left_panel.config(relief="ridge")
-        self.left_panel.after(10, lambda: self.left_panel.config(highlightbackground=border_color))
-        self.left_panel.update()
         self.left_panel_canvas = tk.Canvas(self.left_panel, width=panel_width, height=panel_height, bg=panel_color, highlightthickness=0, bd=0)
         self.left_panel_canvas.place(x=0, y=0, relwidth=1, relheight=1)
         self.left_panel_canvas.create_rectangle(8, 8, panel_width-8, panel_height-8, outline=border_color, width=2, fill=panel_color)
@@ -167,8 +123,31 @@ class App:
             fg="white", bg=panel_color, pady=4
         )
         left_title.pack(pady=(0, 8))
+        self.left_content = left_content
+        self.launch.mark("widgets built")
+
+    # First paint
+    def on_first_paint(self, event=None):
+        if self.launch.mark("first paint"):
+            self.root.after_idle(self.build_deferred)
+
+    # Deferred widgets
+    def build_deferred(self):
+        """
+        Widgets that are not needed to use the page, built once it is up.
+        """
+        devs = [
+            "• Joson, Ivan",
+            "• Mamorno, Joshua",
+            "• Miano, Mike Jester",
+            "• Pilar, Mark Aljon",
+            "• Santos, Dave Ulrich",
+            "• Toledana, Cedrick"
+        ]
+        for dev in devs:
+            tk.Label(self.right_content, text=dev, font=("Arial", 10), fg="#e0e6f0", bg=self.panel_color).pack(anchor="w", padx=48, pady=0, before=self.dev_spacer)
         left_desc = tk.Label(
-            left_content,
+            self.left_content,
             text=(
                 "Insertion Sort builds the final sorted array (or list) one item at a time.\n"
                 "It iterates through the input elements and removes one element per iteration,\n"
@@ -179,11 +158,18 @@ class App:
                 "- The step-by-step process of placing an element in its correct position.\n\n"
                 "Insertion Sort is efficient for small data sets or data sets that are already substantially sorted."
             ),
-            font=("Arial", 10), fg="white", bg=panel_color, justify="center", wraplength=410
+            font=("Arial", 10), fg="white", bg=self.panel_color, justify="center", wraplength=410
         )
         left_desc.pack(pady=(0, 0), padx=8)
+        self.launch.mark("deferred widgets built")
+
+    # First click
+    def on_first_click(self, event=None):
+        self.launch.mark("first click")
+
     # Button click
     def on_go_sort_click(self):
+        self.launch.mark("go sort clicked")
         print("Redirecting to loading screen...")
         try:
             current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -196,6 +182,10 @@ class App:
 
 # Main run
 if __name__ == "__main__":
+    launch = LaunchTimer()
+    launch.mark("imports done")
     root = tk.Tk()
-    app = App(root)
-    root.mainloop()
\ No newline at end of file
+    app = App(root, launch)
+    root.mainloop()
+    if launch_report_requested():
+        launch.print_report()
\ No newline at end of file
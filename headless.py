@@ -0,0 +1,208 @@
+"""
+Headless command-line mode for the Insertion Sort Visualizer.
+Sorts arrays given as arguments, in files or on stdin and prints the
+statistics without starting Tk.
+
+    python -m headless 5,3,9,1
+    python -m headless --file arrays.txt --json
+    echo "4 2 7 1" | python -m headless --trace-out run.isvt
+    python -m headless --csv people.csv --key age --output sorted.csv
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from sort_trace import OP_SELECT, OP_COMPARE, OP_SHIFT, OP_MOVE, MOVE_OPS, TRACE_BUILDERS, iter_trace
+from trace_file import write_trace
+from records import load_records
+from profiling import PROFILE_ENV, session_from_env
+
+
+# Parse
+def parse_array(text):
+    """
+    Integers separated by commas and/or whitespace.
+    """
+    values = text.replace(',', ' ').split()
+    return [int(value) for value in values]
+
+
+# Read
+def read_arrays(args, stdin=None):
+    """
+    Arrays from the positional arguments, --file and stdin, in that order.
+    """
+    stdin = sys.stdin if stdin is None else stdin
+    arrays = []
+    sources = list(args.arrays)
+    if args.file:
+        with open(args.file, 'r', encoding='utf-8') as f:
+            sources.extend(line for line in f if line.strip() and not line.startswith('#'))
+    if '-' in sources or (not sources and not stdin.isatty()):
+        sources = [s for s in sources if s != '-']
+        sources.extend(line for line in stdin if line.strip() and not line.startswith('#'))
+    for source in sources:
+        arrays.append(parse_array(source))
+    return arrays
+
+
+# Analyze
+def analyze(data, variant='insertion', trace_path=None):
+    """
+    Sort data and return its statistics, optionally writing the trace.
+    """
+    stats = {'length': len(data), 'algorithm': variant,
+             'comparisons': 0, 'shifts': 0, 'swaps': 0, 'iterations': 0}
+
+    def counted(events):
+        for event in events:
+            op = event[0]
+            if op == OP_COMPARE:
+                stats['comparisons'] += 1
+            elif op in MOVE_OPS:
+                stats['swaps'] += 1
+                if op == OP_SHIFT or op == OP_MOVE:
+                    stats['shifts'] += 1
+            elif op == OP_SELECT:
+                stats['iterations'] += 1
+            yield event
+
+    start = time.perf_counter()
+    events = counted(iter_trace(data, variant, verbose=True))
+    if trace_path:
+        write_trace(trace_path, data, events, variant, verbose=True)
+    else:
+        for _ in events:
+            pass
+    stats['seconds'] = time.perf_counter() - start
+    return stats
+
+
+# Parser
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="insertion_sort_visualizer",
+        description="Insertion Sort Visualizer. Without --headless the GUI is started.")
+    parser.add_argument('--headless', action='store_true',
+                        help="sort without a window and print statistics")
+    parser.add_argument('arrays', nargs='*',
+                        help="arrays such as 5,3,9,1 ('-' reads stdin, one array per line)")
+    parser.add_argument('--file', help="file with one array per line")
+    parser.add_argument('--algorithm', default='insertion', choices=sorted(TRACE_BUILDERS),
+                        help="sorting algorithm (default: insertion)")
+    parser.add_argument('--json', action='store_true', help="print JSON instead of text")
+    parser.add_argument('--trace-out', metavar='PATH',
+                        help="write the trace file; use {index} in PATH for several arrays")
+    parser.add_argument('--batch', action='store_true',
+                        help="analyze many arrays on a process pool and print histograms")
+    parser.add_argument('--generate', action='append', metavar='SPEC',
+                        help="batch: generate arrays, kind:count:size[:seed] with kind "
+                             "random, nearly, reversed or sorted")
+    parser.add_argument('--csv', metavar='PATH',
+                        help="sort the records of a CSV file (first row is the header) by --key")
+    parser.add_argument('--key', default='1', metavar='COLUMN',
+                        help="csv: key column, by name or 1-based number (default: 1)")
+    parser.add_argument('--output', metavar='PATH',
+                        help="batch: write one JSON line per array to PATH; "
+                             "csv: write the sorted records to PATH")
+    parser.add_argument('--workers', type=int, help="batch: worker processes (default: all cores)")
+    parser.add_argument('--chunk-size', type=int, default=256,
+                        help="batch: arrays per task (default: 256)")
+    parser.add_argument('--profile', nargs='?', const='.', metavar='DIR',
+                        help="profile the session and write reports to DIR on exit "
+                             "(same as setting ISV_PROFILE)")
+    return parser
+
+
+# Run
+def run(args, out=None):
+    out = sys.stdout if out is None else out
+    if args.batch:
+        import batch
+        return batch.run(args, out)
+    if args.csv:
+        return run_records(args, out)
+    try:
+        arrays = read_arrays(args)
+    except (OSError, ValueError) as e:
+        print(f"Error reading input: {str(e)}", file=sys.stderr)
+        return 2
+    if not arrays:
+        print("No arrays given", file=sys.stderr)
+        return 2
+    if args.trace_out and len(arrays) > 1 and '{index}' not in args.trace_out:
+        print("--trace-out needs {index} in the path when sorting several arrays", file=sys.stderr)
+        return 2
+
+    results = []
+    for index, data in enumerate(arrays, start=1):
+        trace_path = args.trace_out.format(index=index) if args.trace_out else None
+        stats = analyze(data, args.algorithm, trace_path)
+        results.append(stats)
+        if not args.json:
+            print(f"Array {index}: length={stats['length']} comparisons={stats['comparisons']} "
+                  f"shifts={stats['shifts']} swaps={stats['swaps']} "
+                  f"iterations={stats['iterations']} time={stats['seconds']:.6f}s", file=out)
+    if args.json:
+        json.dump(results if len(results) > 1 else results[0], out, indent=2)
+        out.write("\n")
+    return 0
+
+
+# Records
+def run_records(args, out):
+    """
+    Sort the records of args.csv by args.key and print the statistics,
+    including the time spent extracting the keys.
+    """
+    try:
+        records = load_records(args.csv, args.key)
+    except (OSError, ValueError) as e:
+        print(f"Error reading records: {str(e)}", file=sys.stderr)
+        return 2
+    ranks = list(records.ranks)
+    stats = analyze(ranks, args.algorithm, args.trace_out)
+    stats.update({'records': len(records), 'key_column': records.column,
+                  'numeric_keys': records.numeric, 'distinct_keys': len(records.keys),
+                  'key_seconds': records.key_seconds})
+    if args.output:
+        try:
+            records.write_sorted(args.output, iter_trace(ranks, args.algorithm, verbose=True))
+        except OSError as e:
+            print(f"Error writing records: {str(e)}", file=sys.stderr)
+            return 2
+    if args.json:
+        json.dump(stats, out, indent=2)
+        out.write("\n")
+    else:
+        print(f"Records: {stats['records']} key={stats['key_column']} "
+              f"distinct={stats['distinct_keys']} key extraction={stats['key_seconds']:.6f}s "
+              f"comparisons={stats['comparisons']} shifts={stats['shifts']} "
+              f"swaps={stats['swaps']} time={stats['seconds']:.6f}s", file=out)
+    return 0
+
+
+# Profiled run
+def run_profiled(args, out=None):
+    """
+    run(), profiled when --profile is given or ISV_PROFILE is set.
+    """
+    if args.profile:
+        os.environ[PROFILE_ENV] = args.profile
+    profiler = session_from_env()
+    code = run(args, out)
+    if profiler is not None:
+        print("Profile written to " + ", ".join(profiler.finish()), file=sys.stderr)
+    return code
+
+
+def main(argv=None):
+    # Main run
+    args = build_parser().parse_args(argv)
+    return run_profiled(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,29 +1,69 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog, simpledialog
 import random
 import math
+import os
+import sys
 import time
-
-def main():
+from collections import deque
+from sort_trace import (OP_SELECT, OP_COMPARE, OP_DONE, OP_NAMES, apply_event,
+                        count_inversions, TraceStep, HistoryEntry)
+from trace_cache import TraceCache, cache_dir_from_env, trace_key
+from trace_worker import TraceWorker
+from scheduler import TickScheduler
+from lanes import LaneView, SortLane, lane_inputs
+from race import RaceView, TracePrecompute
+from headless import build_parser, run_profiled as run_headless
+from trace_file import write_trace, MappedTrace
+from profiling import PROFILE_ENV, session_from_env
+from step_history import StepHistory
+from session import SessionState, save_session as write_session, load_session as read_session
+from palette import BAR_STATES, THEMES, TransitionLUT, style_settings
+from records import load_records
+from bar_geometry import BarGeometry
+from playlist import LessonPlaylist, read_lesson
+
+# Opcode for each OP_NAMES name, used for step_mode in session files
+OP_CODES = {name: op for op, name in OP_NAMES.items()}
+
+def main(argv=None):
     # Main run
+    args = build_parser().parse_args(argv)
+    if args.profile:
+        os.environ[PROFILE_ENV] = args.profile
+    if args.headless:
+        sys.exit(run_headless(args))
     root = tk.Tk()
     app = InsertionSortVisualizer(root)
     root.mainloop()
 
 class InsertionSortVisualizer:
+    TRACE_POLL_MS = 16
+    # Trace variants playback can group by iteration; Shell sort revisits i per gap
+    PLAYABLE_VARIANTS = ('insertion', 'binary')
+    TTK_THEMES = {'dark': 'isv_dark', 'light': 'isv_light'}
+    SPEEDS = [
+        ("Slow", "slow", 2000),
+        ("Normal", "normal", 500),
+        ("Fast", "fast", 5)
+    ]
+
     # Init
-    def __init__(self, root):
+    def __init__(self, root, build=True):
+        """
+        With build=False the widgets are left to the caller, which runs
+        ui_steps() (e.g. a slice per idle callback) and then show().
+        """
+        self.profiler = session_from_env()
         self.root = root
-        self.root.title("Insertion Sort Visualizer")
-        self.root.state('zoomed')
-        self.root.attributes('-fullscreen', True)
-        self.root.minsize(800, 500)
         self.is_dark_theme = True
         self.canvas_width = 0
         self.canvas_height = 0
         self.speed = 100
         self.data = []
+        self.display_data = []
         self.initial_data = None
+        self.records = None  # RecordSet when sorting CSV records; data holds key ranks
         self.paused = False
         self.sorting = False
         self.step_by_step = False
@@ -33,33 +73,69 @@ class InsertionSortVisualizer:
         self.swaps = 0
         self.current_iteration = 0
         self.total_iterations = 0
+        self.work_done = 0
+        self.total_work = 0
+        self.frame_time = 16.0  # measured ms between animation frames
         self.step_count = 0
         self.animation_frames = 30
         self.current_frame = 0
-        self.animation_data = None
+        self.animation_move = None
         self.animation_type = None
         self.animation_colors = None
         self.current_step = None
-        self.animation_queue = []
+        self.animation_queue = deque()
         self.is_animating = False
+        self.trace = None
+        self.trace_pos = 0
+        self.trace_cache = TraceCache(cache_dir=cache_dir_from_env())
+        self.loaded_trace = None
+        self.trace_worker = None
+        self.trace_worker_key = None
+        self.trace_poll_job = None
+        self.sort_job = None
+        self.frame_job = None
+        self.resize_job = None
+        self.resume_iteration = None
+        self.scheduler = TickScheduler(root)
+        self.lane_view = None
+        self.race_precompute = None
+        self.race_job = None
+        self.playlist = None
+        self.playlist_job = None
+        self.stats_interval = 100  # ms between stat flushes when no frame is drawn
+        self.stats_job = None
+        self._stats_dirty = False
+        self._stats_shown = {}
+        self.step_i = 0
+        self.step_j = None
+        self.step_current = None
+        self.step_mode = None
         self.animation_speed_factor = 1.0
-        self._cached_colors = {}
+        self.bar_items = []  # persistent canvas rectangles, one per element
+        self.label_items = []
+        self.step_label_items = None
+        self.step_label_shown = None
+        self.bar_layout = None  # the BarGeometry the bar items were built for
+        self.bar_geometry = None
+        self.bar_scale = None  # scale of the data set, found once per data set
+        self.bar_values = []
+        self.bar_states = []  # state of each bar as last drawn
+        self.bar_fills = []
+        self.slide_state = None  # [distance, current offset, layout] of a move
+        self.fade_from = None
+        self.fade_factor = 1.0
         self._last_draw_time = 0
         self._min_frame_time = 16
-        self.colors = {
-            'default': "#4C566A",
-            'current': "#EBCB8B",
-            'compare': "#BF616A",
-            'sorted': "#A3BE8C",
-            'insert': "#81A1C1",
-            'text': "#ECEFF4",
-            'text_bg': "#2E3440"
-        }
+        self.color_luts = {name: TransitionLUT(theme['colors']) for name, theme in THEMES.items()}
+        self.colors = THEMES[self.theme_name()]['colors']
+        self.color_lut = self.color_luts[self.theme_name()]
         self.style = ttk.Style()
         self.configure_style()
         self.current_step_number = 0
         self.total_steps = 0
-        self.step_history = []
+        self.history_max_bytes = 256 * 1024  # compressed history kept in memory
+        self.step_history = StepHistory(max_bytes=self.history_max_bytes)
+        self.history_base = 0  # trace position the step history starts at
         self.current_substep = 0
         self.total_substeps = 0
         self.speed_indicator = None
@@ -67,140 +143,67 @@ class InsertionSortVisualizer:
         self.next_step_button = None
         self.step_label = None
         self.substep_label = None
-        self.build_ui()
+        self.main_frame = None
+        if build:
+            self.build_ui()
+        if self.profiler is not None:
+            self.profiler.instrument(self)
 
     # Style
     def configure_style(self):
-        self.style.theme_use('clam')
-        if self.is_dark_theme:
-            bg_color = "#1E1E1E"
-            fg_color = "#FFFFFF"
-            accent_color = "#007ACC"
-            button_color = "#2D2D2D"
-            hover_color = "#3E3E3E"
-            canvas_bg = "#252526"
-            text_color = "#D4D4D4"
-            border_color = "#3E3E3E"
-            radio_bg = "#2D2D2D"
-            radio_fg = "#FFFFFF"
-            radio_selected = "#007ACC"
-            radio_hover = "#3E3E3E"
-            radio_border = "#404040"
-            radio_container_bg = "#252526"
-            self.style.configure("TFrame", background=bg_color)
-            self.style.configure("TLabel", background=bg_color, foreground=text_color, font=("Segoe UI", 10))
-            self.style.configure("TButton",
-                               background=button_color,
-                               foreground=text_color,
-                               font=("Segoe UI", 10),
-                               borderwidth=0,
-                               focusthickness=0,
-                               padding=8)
-            self.style.map("TButton",
-                          background=[('active', hover_color)],
-                          foreground=[('active', fg_color)])
-            self.style.configure("TEntry",
-                               fieldbackground=button_color,
-                               foreground=text_color,
-                               padding=8,
-                               font=("Segoe UI", 10))
-            self.style.configure("Tooltip.TFrame", background="#2D2D2D")
-            self.style.configure("Tooltip.TLabel", background="#2D2D2D", foreground="#FFFFFF")
-            self.style.configure("CanvasBorder.TFrame", background=border_color)
-            self.style.configure("Speed.TFrame",
-                               background=radio_container_bg,
-                               relief="flat",
-                               borderwidth=1)
-            self.style.configure("Speed.TRadiobutton",
-                               background=radio_bg,
-                               foreground=radio_fg,
-                               font=("Segoe UI", 10, "bold"),
-                               padding=(15, 8),
-                               indicatorcolor=radio_selected,
-                               indicatorbackground=radio_bg,
-                               indicatorrelief="flat",
-                               borderwidth=1,
-                               relief="flat",
-                               focusthickness=0)
-            self.style.map("Speed.TRadiobutton",
-                          background=[('active', radio_hover),
-                                    ('selected', radio_selected)],
-                          foreground=[('active', radio_fg),
-                                    ('selected', "#FFFFFF")],
-                          indicatorcolor=[('selected', "#FFFFFF")],
-                          indicatorbackground=[('selected', radio_selected)],
-                          relief=[('selected', 'flat')],
-                          borderwidth=[('selected', 0)],
-                          focusthickness=[('selected', 0)])
-        else:
-            bg_color = "#AAAAAA"
-            fg_color = "#333333"
-            accent_color = "#0078D4"    
-            button_color = "#E1E1E1"
-            hover_color = "#D0D0D0"
-            canvas_bg = "#FFFFFF"
-            text_color = "#333333"
-            border_color = "#CCCCCC"
-            radio_bg = "#FFFFFF"
-            radio_fg = "#333333"
-            radio_selected = "#0078D4"
-            radio_hover = "#F0F0F0"
-            radio_border = "#E0E0E0"
-            radio_container_bg = "#F8F8F8"
-            self.style.configure("TFrame", background=bg_color)
-            self.style.configure("TLabel", background=bg_color, foreground=text_color, font=("Segoe UI", 10))
-            self.style.configure("TButton",
-                               background=button_color,
-                               foreground=text_color,
-                               font=("Segoe UI", 10),
-                               borderwidth=0,
-                               focusthickness=0,
-                               padding=8)
-            self.style.map("TButton",
-                          background=[('active', hover_color)],
-                          foreground=[('active', fg_color)])
-            self.style.configure("TEntry",
-                               fieldbackground=button_color,
-                               foreground=text_color,
-                               padding=8,
-                               font=("Segoe UI", 10))
-            self.style.configure("Tooltip.TFrame", background="#2D2D2D")
-            self.style.configure("Tooltip.TLabel", background="#2D2D2D", foreground="#FFFFFF")
-            self.style.configure("CanvasBorder.TFrame", background=border_color)
-            self.style.configure("Speed.TFrame",
-                               background=radio_container_bg,
-                               relief="flat",
-                               borderwidth=1)
-            self.style.configure("Speed.TRadiobutton",
-                               background=radio_bg,
-                               foreground=radio_fg,
-                               font=("Segoe UI", 10, "bold"),
-                               padding=(15, 8),
-                               indicatorcolor=radio_selected,
-                               indicatorbackground=radio_bg,
-                               indicatorrelief="flat",
-                               borderwidth=1,
-                               relief="flat",
-                               focusthickness=0)
-            self.style.map("Speed.TRadiobutton",
-                          background=[('active', radio_hover),
-                                    ('selected', radio_selected)],
-                          foreground=[('active', radio_fg),
-                                    ('selected', "#FFFFFF")],
-                          indicatorcolor=[('selected', "#FFFFFF")],
-                          indicatorbackground=[('selected', radio_selected)],
-                          relief=[('selected', 'flat')],
-                          borderwidth=[('selected', 0)],
-                          focusthickness=[('selected', 0)])
+        """
+        Compile both themes into ttk themes once; show() switches to the
+        current one.
+        """
+        existing = self.style.theme_names()
+        for name, theme in THEMES.items():
+            if self.TTK_THEMES[name] not in existing:
+                self.style.theme_create(self.TTK_THEMES[name], parent='clam',
+                                        settings=style_settings(theme))
+
+    # Theme name
+    def theme_name(self):
+        return 'dark' if self.is_dark_theme else 'light'
 
     # UI
     def build_ui(self):
+        for step in self.ui_steps():
+            step()
+        self.show()
+
+    # UI steps
+    def ui_steps(self):
+        """
+        build_ui in pieces. The main frame is only packed by show(), so
+        nothing is laid out or drawn until every piece is built.
+        """
+        return [self.build_controls, self.build_canvas, self.build_statistics,
+                self.build_buttons, self.build_status]
+
+    # Show
+    def show(self):
+        """
+        Take over the window. Everything that changes the shared root
+        (size, theme, title) happens here, so a visualizer built behind
+        the loading screen leaves it untouched until then.
+        """
+        self.root.state('zoomed')
+        self.root.attributes('-fullscreen', True)
+        self.root.minsize(800, 500)
+        self.style.theme_use(self.TTK_THEMES[self.theme_name()])
+        self.root.title("Insertion Sort Visualizer")
+        self.root.bind('<t>', lambda e: self.toggle_theme())
+        # Closing from the window manager goes through the same teardown
+        self.root.protocol("WM_DELETE_WINDOW", self.close_window)
+        self.main_frame.pack(fill=tk.BOTH, expand=True)
+
+    # Controls
+    def build_controls(self):
         # Main container with padding
-        main_frame = ttk.Frame(self.root, padding="20")
-        main_frame.pack(fill=tk.BOTH, expand=True)
+        self.main_frame = ttk.Frame(self.root, padding="20")
 
         # Top Controls with better spacing
-        control_frame = ttk.Frame(main_frame)
+        control_frame = ttk.Frame(self.main_frame)
         control_frame.pack(fill=tk.X, pady=(0, 20))
 
         # Input section
@@ -215,6 +218,9 @@ class InsertionSortVisualizer:
         submit_btn = ttk.Button(input_frame, text="Submit", command=self.submit_input)
         submit_btn.pack(side=tk.LEFT, padx=5)
 
+        csv_btn = ttk.Button(input_frame, text="Load CSV", command=self.load_csv)
+        csv_btn.pack(side=tk.LEFT, padx=5)
+
         # Random generation section
         random_frame = ttk.Frame(control_frame)
         random_frame.pack(side=tk.LEFT, padx=20)
@@ -226,6 +232,21 @@ class InsertionSortVisualizer:
         generate_btn = ttk.Button(random_frame, text="Generate Random", command=self.generate_random)
         generate_btn.pack(side=tk.LEFT, padx=5)
 
+        # Lesson playlist section
+        lesson_frame = ttk.Frame(control_frame)
+        lesson_frame.pack(side=tk.LEFT, padx=20)
+
+        load_lesson_btn = ttk.Button(lesson_frame, text="Load Lesson", command=self.load_lesson)
+        load_lesson_btn.pack(side=tk.LEFT, padx=5)
+
+        self.prev_lesson_button = ttk.Button(lesson_frame, text="Prev Array", state='disabled',
+                                             command=lambda: self.show_lesson_entry(-1))
+        self.prev_lesson_button.pack(side=tk.LEFT, padx=5)
+
+        self.next_lesson_button = ttk.Button(lesson_frame, text="Next Array", state='disabled',
+                                             command=lambda: self.show_lesson_entry(1))
+        self.next_lesson_button.pack(side=tk.LEFT, padx=5)
+
         # Speed control section
         speed_frame = ttk.Frame(control_frame)
         speed_frame.pack(side=tk.RIGHT)
@@ -248,13 +269,7 @@ class InsertionSortVisualizer:
         self.speed_var = tk.StringVar(value="normal")
         
         # Create radio buttons with custom styling
-        speeds = [
-            ("Slow", "slow", 2000),
-            ("Normal", "normal", 500),
-            ("Fast", "fast", 5)
-        ]
-        
-        for text, value, speed in speeds:
+        for text, value, speed in self.SPEEDS:
             radio = ttk.Radiobutton(
                 speed_radio_frame,
                 text=text,
@@ -268,8 +283,10 @@ class InsertionSortVisualizer:
         # Set initial speed
         self.speed = 500  # Default to normal speed
 
+    # Canvas
+    def build_canvas(self):
         # Canvas Frame with border
-        canvas_frame = ttk.Frame(main_frame)
+        canvas_frame = ttk.Frame(self.main_frame)
         canvas_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 20))
         
         # Add canvas border
@@ -277,17 +294,16 @@ class InsertionSortVisualizer:
         canvas_border.pack(fill=tk.BOTH, expand=True, padx=2, pady=2)
         
         self.canvas = tk.Canvas(canvas_border, 
-                              bg="#3B4252" if self.is_dark_theme else "#FFFFFF",
+                              bg=THEMES[self.theme_name()]['canvas_bg'],
                               bd=0,
                               highlightthickness=0)
         self.canvas.pack(fill=tk.BOTH, expand=True)
         self.canvas.bind('<Configure>', self.on_canvas_resize)
-        
-        # Add keyboard shortcuts
-        self.root.bind('<t>', lambda e: self.toggle_theme())
 
+    # Statistics
+    def build_statistics(self):
         # Statistics Frame
-        stats_frame = ttk.Frame(main_frame)
+        stats_frame = ttk.Frame(self.main_frame)
         stats_frame.pack(fill=tk.X, pady=(0, 10))
         
         # Progress bar
@@ -329,14 +345,21 @@ class InsertionSortVisualizer:
                                      font=("Segoe UI", 9))
         self.substep_label.pack(side=tk.LEFT, padx=5)
 
+        # Estimated time until the sort finishes
+        self.eta_label = ttk.Label(stats_container,
+                                 text="ETA: --",
+                                 font=("Segoe UI", 9))
+        self.eta_label.pack(side=tk.LEFT, padx=5)
+
         # Add speed indicator
         self.speed_indicator = ttk.Label(stats_container,
                                        text="Speed: Normal",
                                        font=("Segoe UI", 9))
         self.speed_indicator.pack(side=tk.RIGHT, padx=5)
 
-        # Buttons
-        button_frame = ttk.Frame(main_frame)
+    # Buttons
+    def build_buttons(self):
+        button_frame = ttk.Frame(self.main_frame)
         button_frame.pack(fill=tk.X, pady=(0, 10))
 
         # Left side buttons
@@ -359,9 +382,36 @@ class InsertionSortVisualizer:
         step_nav_frame = ttk.Frame(left_buttons)
         step_nav_frame.pack(side=tk.LEFT, padx=20)
         
+        self.prev_step_button = ttk.Button(step_nav_frame, text="Prev Step", command=self.prev_step,
+                                           state='disabled')
+        self.prev_step_button.pack(side=tk.LEFT, padx=5)
+
         self.next_step_button = ttk.Button(step_nav_frame, text="Next Step", command=self.next_step)
         self.next_step_button.pack(side=tk.LEFT, padx=5)
 
+        # Trace file buttons
+        trace_frame = ttk.Frame(left_buttons)
+        trace_frame.pack(side=tk.LEFT, padx=20)
+
+        save_trace_btn = ttk.Button(trace_frame, text="Save Trace", command=self.save_trace)
+        save_trace_btn.pack(side=tk.LEFT, padx=5)
+
+        load_trace_btn = ttk.Button(trace_frame, text="Load Trace", command=self.load_trace)
+        load_trace_btn.pack(side=tk.LEFT, padx=5)
+
+        save_session_btn = ttk.Button(trace_frame, text="Save Session", command=self.save_session)
+        save_session_btn.pack(side=tk.LEFT, padx=5)
+
+        load_session_btn = ttk.Button(trace_frame, text="Load Session", command=self.load_session)
+        load_session_btn.pack(side=tk.LEFT, padx=5)
+
+        # Comparison mode button
+        self.compare_btn = ttk.Button(left_buttons, text="Compare Inputs", command=self.toggle_compare_mode)
+        self.compare_btn.pack(side=tk.LEFT, padx=5)
+
+        self.race_btn = ttk.Button(left_buttons, text="Race", command=self.toggle_race_mode)
+        self.race_btn.pack(side=tk.LEFT, padx=5)
+
         # Right side theme toggle
         self.theme_button = ttk.Button(button_frame, text="Switch Theme (T)", command=self.toggle_theme)
         self.theme_button.pack(side=tk.RIGHT, padx=5)
@@ -370,14 +420,15 @@ class InsertionSortVisualizer:
         close_btn = ttk.Button(button_frame, text="Close Window", command=self.close_window)
         close_btn.pack(side=tk.RIGHT, padx=5)
 
-        # Status bar
-        status_frame = ttk.Frame(main_frame)
+    # Status bar
+    def build_status(self):
+        status_frame = ttk.Frame(self.main_frame)
         status_frame.pack(fill=tk.X, pady=(10, 0))
         
         self.status_label = ttk.Label(status_frame, 
                                     text="",
                                     font=("Segoe UI", 11, "bold"),
-                                    foreground="#A3BE8C" if self.is_dark_theme else "#2E3440")
+                                    foreground=THEMES[self.theme_name()]['status_fg'])
         self.status_label.pack(side=tk.LEFT)
 
     # Speed
@@ -412,6 +463,8 @@ class InsertionSortVisualizer:
                 return
                 
             # Clear existing data and animation state
+            self.close_loaded_trace()
+            self.records = None
             self.data = []
             self.animation_colors = None
             self.current_step = None
@@ -427,7 +480,7 @@ class InsertionSortVisualizer:
             
             # Draw the bars
             self.root.update_idletasks()  # Ensure canvas is updated
-            self.draw_bars(self.data)
+            self.show_data()
             self.status_label.config(text=f"Generated {length} random numbers")
             
         except ValueError:
@@ -436,29 +489,85 @@ class InsertionSortVisualizer:
             print(f"Error generating random array: {str(e)}")
             messagebox.showerror("Error", "Failed to generate random array")
 
-    # Bar color
-    def get_bar_color(self, index, color_positions):
+    # Bar state
+    def get_bar_state(self, index, color_positions):
         if not color_positions:
-            return self.colors['default']
-            
+            return 'default'
+
         if index in color_positions.get('current', []):
-            return self.colors['current']
+            return 'current'
         elif index in color_positions.get('compare', []):
-            return self.colors['compare']
+            return 'compare'
         elif index in color_positions.get('sorted', []):
-            return self.colors['sorted']
+            return 'sorted'
         elif index in color_positions.get('insert', []):
-            return self.colors['insert']
-        return self.colors['default']
+            return 'insert'
+        return 'default'
+
+    # Bar color
+    def get_bar_color(self, index, color_positions):
+        return self.colors[self.get_bar_state(index, color_positions)]
+
+    # Clear
+    def clear_canvas(self):
+        """
+        Delete every canvas item; bars are rebuilt on the next draw.
+        """
+        self.canvas.delete("all")
+        self.bar_items = []
+        self.bar_layout = None
+        self.bar_geometry = None
+        self.bar_scale = None
+        self.slide_state = None
+
+    # Build bars
+    def build_bars(self, data, geometry):
+        """
+        Create the grid and one persistent bar, value label and label
+        background per element. Later frames only update these items.
+        """
+        self.canvas.delete("all")
+        n = len(data)
+        grid_spacing = 50
+        for y in range(0, self.canvas_height, grid_spacing):
+            self.canvas.create_line(20, y, self.canvas_width - 20, y,
+                                    fill=THEMES[self.theme_name()]['grid'],
+                                    dash=(2, 4), tags="grid")
+        # Bars first so every label sits above them
+        self.bar_items = [self.canvas.create_rectangle(0, 0, 0, 0, outline="", width=0,
+                                                       fill=self.colors['default'],
+                                                       tags=("bar", "st_default"))
+                          for _ in range(n)]
+        self.label_items = []
+        for _ in range(n):
+            bg = self.canvas.create_rectangle(0, 0, 0, 0, fill=self.colors['text_bg'],
+                                              outline="", tags="label_bg")
+            text = self.canvas.create_text(0, 0, text="", fill=self.colors['text'],
+                                           font=("Segoe UI", 9), tags="label")
+            self.label_items.append((text, bg))
+        step_bg = self.canvas.create_rectangle(0, 0, 0, 0, fill=self.colors['text_bg'],
+                                               outline="", tags="label_bg", state='hidden')
+        step_text = self.canvas.create_text(0, 0, text="", fill=self.colors['text'],
+                                            font=("Segoe UI", 8), tags="label", state='hidden')
+        self.step_label_items = (step_text, step_bg)
+        self.step_label_shown = None
+        self.bar_layout = geometry
+        self.bar_values = [None] * n
+        self.bar_states = ['default'] * n
+        self.bar_fills = [self.colors['default']] * n
 
     # Draw bars
     def draw_bars(self, data, color_positions=None):
+        """
+        Bring the persistent bar items in line with data and the colors;
+        only bars whose value, state or fade color changed are touched.
+        """
         try:
             if not self.canvas.winfo_exists():
                 return
-                
-            self.canvas.delete("all")
+
             if not data:
+                self.clear_canvas()
                 return
 
             # Ensure we have valid canvas dimensions
@@ -468,77 +577,84 @@ class InsertionSortVisualizer:
                 if self.canvas_width <= 0 or self.canvas_height <= 0:
                     return
 
-            # Calculate dimensions
-            max_val = max(data)
-            if max_val == 0:  # Prevent division by zero
-                return
-
-            bar_width = (self.canvas_width - 40) / len(data)  # Leave some padding on sides
-            bar_spacing = 2  # Space between bars
-            effective_bar_width = max(2, bar_width - bar_spacing)  # Ensure minimum bar width
-            top_margin = 60  # Space for text
-            bottom_margin = 20
-            available_height = self.canvas_height - top_margin - bottom_margin
-
-            # Draw background grid
-            grid_spacing = 50
-            for i in range(0, self.canvas_height, grid_spacing):
-                self.canvas.create_line(20, i, self.canvas_width - 20, i, 
-                                      fill="#2E3440" if self.is_dark_theme else "#E5E9F0", 
-                                      dash=(2, 4))
-
-            # First pass: draw all bars
+            # The table holds for one data set (its scale) on one canvas size;
+            # the scale is found once, when a new data set comes in
+            scale = self.bar_scale
+            if scale is None:
+                scale = self.bar_scale = self.data_scale(data)
+            geometry = self.bar_geometry
+            if geometry is None or geometry.key != (len(data), self.canvas_width, self.canvas_height, scale):
+                geometry = self.bar_geometry = self.build_geometry(data, self.records, scale)
+                if geometry is None:
+                    return
+            if geometry is not self.bar_layout or not self.bar_items:
+                self.build_bars(data, geometry)
+            y0 = geometry.y0
+
+            # Fade bars that changed state since the last step
+            fade_from = self.fade_from
+            if self.fade_factor >= 1.0 or fade_from is None or len(fade_from) != len(data):
+                fade_from = None
+
+            canvas = self.canvas
+            states = self.bar_states
+            fills = self.bar_fills
+            values = self.bar_values
+            current_x = None
             for i, val in enumerate(data):
-                x0 = 20 + (i * bar_width)  # Start with padding
-                x1 = x0 + effective_bar_width
-                y0 = self.canvas_height - bottom_margin
-                y1 = y0 - (val / max_val * available_height)
-
-                # Get color based on state
-                color = self.get_bar_color(i, color_positions)
-
-                # Draw bar with rounded corners
-                self.canvas.create_rectangle(x0, y0, x1, y1, 
-                                          fill=color, outline="", width=0)
+                state = self.get_bar_state(i, color_positions)
+                if state == 'current' and current_x is None:
+                    current_x = i
+
+                # Move the item to its new state tag
+                item = self.bar_items[i]
+                if state != states[i]:
+                    canvas.dtag(item, f"st_{states[i]}")
+                    canvas.addtag_withtag(f"st_{state}", item)
+                    states[i] = state
+                if fade_from is not None and fade_from[i] != state:
+                    color = self.color_lut.color(fade_from[i], state, self.fade_factor)
+                else:
+                    color = self.colors[state]
+                if color != fills[i]:
+                    canvas.itemconfig(item, fill=color)
+                    fills[i] = color
 
-            # Second pass: draw all text
-            for i, val in enumerate(data):
-                x0 = 20 + (i * bar_width)
-                x1 = x0 + effective_bar_width
-                y0 = self.canvas_height - bottom_margin
-                y1 = y0 - (val / max_val * available_height)
-
-                # Calculate text positions
-                text_x = x0 + (effective_bar_width / 2)
-                value_y = max(top_margin, y1 - 10)  # Ensure value text is visible
-                step_y = max(top_margin + 20, y1 - 30)  # Ensure step text is visible
-
-                # Add value text with background
-                text = str(int(val))
-                text_bbox = self.canvas.create_text(text_x, value_y, 
-                                                 text=text, 
-                                                 fill=self.colors['text'], 
-                                                 font=("Segoe UI", 9))
-                bbox = self.canvas.bbox(text_bbox)
+                if val == values[i]:
+                    continue
+                values[i] = val
+                canvas.coords(item, geometry.x0[i], y0, geometry.x1[i], geometry.top(val))
+
+                # Value label with its background
+                text_item, bg_item = self.label_items[i]
+                canvas.coords(text_item, geometry.centers[i], geometry.label_y(val))
+                canvas.itemconfig(text_item, text=self.bar_label(val))
+                bbox = canvas.bbox(text_item)
                 if bbox:
-                    self.canvas.create_rectangle(bbox[0]-2, bbox[1]-2, bbox[2]+2, bbox[3]+2,
-                                              fill=self.colors['text_bg'],
-                                              outline="")
-                    self.canvas.tag_raise(text_bbox)
-                
-                # Add step description if available
-                if self.current_animation and color_positions and i in color_positions.get('current', []):
-                    step_bbox = self.canvas.create_text(text_x, step_y,
-                                                      text=self.current_animation,
-                                                      fill=self.colors['text'],
-                                                      font=("Segoe UI", 8))
-                    bbox = self.canvas.bbox(step_bbox)
+                    canvas.coords(bg_item, bbox[0]-2, bbox[1]-2, bbox[2]+2, bbox[3]+2)
+
+            # Step description above the current element
+            shown = None
+            if self.current_animation and current_x is not None:
+                shown = (self.current_animation, geometry.centers[current_x],
+                         geometry.step_label_y(data[current_x]))
+            if shown != self.step_label_shown:
+                self.step_label_shown = shown
+                step_text, step_bg = self.step_label_items
+                if shown is None:
+                    canvas.itemconfig(step_text, state='hidden')
+                    canvas.itemconfig(step_bg, state='hidden')
+                else:
+                    text, text_x, step_y = shown
+                    canvas.coords(step_text, text_x, step_y)
+                    canvas.itemconfig(step_text, text=text, state='normal')
+                    bbox = canvas.bbox(step_text)
                     if bbox:
-                        self.canvas.create_rectangle(bbox[0]-2, bbox[1]-2, bbox[2]+2, bbox[3]+2,
-                                                  fill=self.colors['text_bg'],
-                                                  outline="")
-                        self.canvas.tag_raise(step_bbox)
+                        canvas.coords(step_bg, bbox[0]-2, bbox[1]-2, bbox[2]+2, bbox[3]+2)
+                        canvas.itemconfig(step_bg, state='normal')
 
+            # Stats ride along with the frame
+            self.flush_statistics()
             self.root.update_idletasks()
             
         except Exception as e:
@@ -546,6 +662,59 @@ class InsertionSortVisualizer:
             # Don't show error message for drawing errors to avoid spam
             # Just log it and continue
 
+    # Geometry
+    def build_geometry(self, data, records=None, scale=None):
+        """
+        Tabulate bar positions and heights for this data set and canvas
+        size. Records are scaled by key, everything else by value.
+        """
+        if records is not None:
+            scale = records
+            fraction = records.scale.__getitem__
+        else:
+            scale = max_val = max(data) if scale is None else scale
+            if max_val == 0:  # Prevent division by zero
+                return None
+            fraction = lambda value: value / max_val
+        return BarGeometry(data, self.canvas_width, self.canvas_height, fraction, scale)
+
+    # Scale
+    def data_scale(self, data):
+        """
+        What bar heights are relative to: the records, or the largest value.
+        """
+        if self.records is not None:
+            return self.records
+        return max(data)
+
+    # Bar label
+    def bar_label(self, value):
+        if self.records is not None:
+            return self.records.labels[value]
+        return str(int(value))
+
+    # Data text
+    def data_text(self):
+        """
+        The array for status messages; records show their keys.
+        """
+        if self.records is not None:
+            return "[" + ", ".join(self.records.labels[value] for value in self.data) + "]"
+        return str(self.data)
+
+    # Show data
+    def show_data(self, geometry=None):
+        """
+        Copy data into the display buffer and draw it, with geometry
+        prepared for it if there is one.
+        """
+        self.stop_compare_mode()
+        self.display_data = self.data.copy()
+        # A new data set may have a new scale
+        self.bar_geometry = geometry
+        self.bar_scale = geometry.scale if geometry is not None else None
+        self.draw_bars(self.display_data)
+
     # Input
     def submit_input(self):
         """
@@ -557,13 +726,15 @@ class InsertionSortVisualizer:
             
         if not self.parse_input():
             return
+        self.close_loaded_trace()
+        self.records = None
             
         # Store the initial data for reference
         self.initial_data = self.data.copy()
         
         # Draw the bars
         self.root.update_idletasks()  # Ensure canvas is updated
-        self.draw_bars(self.data)
+        self.show_data()
         self.status_label.config(text=f"Array submitted: {self.data}")
         
         # Enable start button if not already enabled
@@ -575,6 +746,127 @@ class InsertionSortVisualizer:
                             if isinstance(button, ttk.Button) and button.cget('text') == "Start Sort":
                                 button.config(state='normal')
 
+    # CSV
+    def load_csv(self):
+        """
+        Load CSV records and sort them by a key column.
+        """
+        if self.sorting:
+            messagebox.showwarning("Warning", "Cannot load records while sorting is in progress.")
+            return
+        path = filedialog.askopenfilename(title="Load CSV",
+                                          filetypes=[("CSV files", "*.csv"), ("All files", "*.*")])
+        if not path:
+            return
+        column = simpledialog.askstring("Key Column", "Sort by column (name or number):",
+                                        parent=self.root)
+        if not column:
+            return
+        try:
+            records = load_records(path, column)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Input Error", f"Failed to load records: {str(e)}")
+            return
+        if len(records) > 50:
+            messagebox.showerror("Input Error", "Maximum array length is 50 records.")
+            return
+        self.close_loaded_trace()
+        self.records = records
+        self.data = list(records.ranks)
+        self.initial_data = self.data.copy()
+        self.animation_colors = None
+        self.current_step = None
+        self.show_data()
+        self.status_label.config(text=f"Loaded {len(records)} records by '{records.column}' "
+                                      f"(keys extracted in {records.key_seconds * 1000:.2f} ms)")
+
+    # Lesson
+    def load_lesson(self):
+        """
+        Load a lesson file, one array per line, and show its first array.
+        """
+        if self.sorting:
+            messagebox.showwarning("Warning", "Cannot load a lesson while sorting is in progress.")
+            return
+        path = filedialog.askopenfilename(title="Load Lesson",
+                                          filetypes=[("Lesson files", "*.txt"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            arrays = read_lesson(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Input Error", f"Failed to load lesson: {str(e)}")
+            return
+        self.close_playlist()
+        self.playlist = LessonPlaylist(arrays, self.trace_cache)
+        self.show_lesson_entry(0, absolute=True)
+
+    # Lesson entry
+    def show_lesson_entry(self, index, absolute=False):
+        """
+        Show a lesson array, by position or relative to the current one.
+        Its traces are usually in the cache already, so Start runs at once.
+        """
+        playlist = self.playlist
+        if playlist is None:
+            return
+        if not absolute:
+            index += playlist.position
+        if not 0 <= index < len(playlist):
+            return
+        if self.sorting or self.lane_view is not None or self.race_precompute is not None:
+            self.reset()
+        try:
+            data = playlist.go(index)
+        except Exception as e:
+            print(f"Error preparing lesson: {str(e)}")
+            messagebox.showerror("Error", "Failed to prepare the lesson arrays")
+            return
+        self.close_loaded_trace()
+        self.records = None
+        self.data = data
+        self.initial_data = self.data.copy()
+        self.animation_colors = None
+        self.current_step = None
+        self.show_data(playlist.renders.get(index))
+        self.prev_lesson_button.config(state='normal' if index > 0 else 'disabled')
+        self.next_lesson_button.config(state='normal' if index < len(playlist) - 1 else 'disabled')
+        self.status_label.config(text=f"Lesson array {index + 1}/{len(playlist)}: {self.data}")
+        self.scheduler.cancel(self.playlist_job)
+        self.poll_playlist()
+
+    # Lesson poll
+    def poll_playlist(self):
+        """
+        Collect prefetched traces and prepare the first draw of each
+        ready array while the current one plays.
+        """
+        self.playlist_job = None
+        playlist = self.playlist
+        if playlist is None:
+            return
+        try:
+            ready = playlist.poll()
+        except Exception as e:
+            print(f"Error prefetching lesson traces: {str(e)}")
+            playlist.shutdown()
+            return
+        for index in ready:
+            if index != playlist.position:
+                geometry = self.build_geometry(playlist.arrays[index])
+                if geometry is not None:
+                    playlist.renders[index] = geometry
+        if playlist.pending():
+            self.playlist_job = self.scheduler.call_later(50, self.poll_playlist)
+
+    # Lesson stop
+    def close_playlist(self):
+        self.scheduler.cancel(self.playlist_job)
+        self.playlist_job = None
+        if self.playlist is not None:
+            self.playlist.shutdown()
+            self.playlist = None
+
     # Parse
     def parse_input(self):
         """
@@ -619,28 +911,69 @@ class InsertionSortVisualizer:
     # Stats
     def update_statistics(self):
         """
-        Update stats.
+        Mark stats as changed; they reach the widgets on the next flush.
+        """
+        self._stats_dirty = True
+        if self.stats_job is None:
+            self.stats_job = self.scheduler.call_later(self.stats_interval, self.flush_statistics)
+
+    # Stats flush
+    def flush_statistics(self):
+        """
+        Push changed stats to the widgets.
         """
-        self.comparisons_label.config(text=f"Comparisons: {self.comparisons}")
-        self.swaps_label.config(text=f"Swaps: {self.swaps}")
-        self.iteration_label.config(text=f"Iteration: {self.current_iteration}/{self.total_iterations}")
-        self.step_label.config(text=f"Step: {self.current_step_number}/{self.total_steps}")
-        self.substep_label.config(text=f"Substep: {self.current_substep}/{self.total_substeps}")
-        if self.total_iterations > 0:
-            progress = (self.current_iteration / self.total_iterations) * 100
-            self.progress_var.set(progress)
+        self.scheduler.cancel(self.stats_job)
+        self.stats_job = None
+        if not self._stats_dirty:
+            return
+        self._stats_dirty = False
+        texts = (
+            (self.comparisons_label, f"Comparisons: {self.comparisons}"),
+            (self.swaps_label, f"Swaps: {self.swaps}"),
+            (self.iteration_label, f"Iteration: {self.current_iteration}/{self.total_iterations}"),
+            (self.step_label, f"Step: {self.current_step_number}/{self.total_steps}"),
+            (self.substep_label, f"Substep: {self.current_substep}/{self.total_substeps}"),
+            (self.eta_label, self.eta_text()),
+        )
+        for label, text in texts:
+            if self._stats_shown.get(label) != text:
+                label.config(text=text)
+                self._stats_shown[label] = text
+        if self.total_work > 0:
+            progress = min(100.0, self.work_done / self.total_work * 100)
+            if progress != self.progress_var.get():
+                self.progress_var.set(progress)
+
+    # ETA
+    def eta_text(self):
+        """
+        Remaining time from the work left, the speed setting and the
+        measured frame time.
+        """
+        if self.step_by_step or self.work_done >= self.total_work:
+            return "ETA: --"
+        remaining = max(0, self.total_work - self.work_done)
+        remaining_iterations = max(0, self.total_iterations - self.current_iteration)
+        # A shift plays compare, check and move; an insertion about six steps
+        remaining_inserts = min(remaining, remaining_iterations)
+        steps = 3 * (remaining - remaining_inserts) + 6 * remaining_inserts + len(self.animation_queue)
+        step_ms = self.animation_frames * self.frame_time + 50
+        seconds = max(steps * step_ms, remaining_iterations * self.speed) / 1000
+        return f"ETA: {int(seconds) // 60}:{int(seconds) % 60:02d}"
 
     # Reset
     def reset(self):
         """
         Reset everything.
         """
-        self.canvas.delete("all")
+        self.stop_compare_mode()
+        self.clear_canvas()
         if hasattr(self, 'initial_data') and self.initial_data is not None:
             self.data = self.initial_data.copy()
-            self.draw_bars(self.data)
+            self.show_data()
         else:
             self.data = []
+            self.display_data = []
         self.sorting = False
         self.paused = False
         self.step_by_step = False
@@ -649,14 +982,29 @@ class InsertionSortVisualizer:
         self.status_label.config(text="")
         self.pause_button.config(text="Pause", state='disabled')
         self.next_step_button.config(state='disabled')
+        self.prev_step_button.config(state='disabled')
         self.comparisons = 0
         self.swaps = 0
         self.current_iteration = 0
         self.total_iterations = 0
+        self.work_done = 0
+        self.total_work = 0
         self.step_count = 0
         self.progress_var.set(0)
-        self.animation_queue = []  # Clear animation queue
+        self.animation_queue.clear()  # Clear animation queue
         self.is_animating = False
+        self.animation_move = None
+        self.fade_from = None
+        self.fade_factor = 1.0
+        self.scheduler.cancel(self.sort_job)
+        self.scheduler.cancel(self.frame_job)
+        self.sort_job = None
+        self.frame_job = None
+        self.resume_iteration = None
+        self.cancel_trace_worker()
+        self.step_history.clear()
+        self.trace = None
+        self.trace_pos = 0
         self.update_statistics()
         self.step_btn.config(state='normal')  # Enable Step-by-Step after reset
 
@@ -667,6 +1015,9 @@ class InsertionSortVisualizer:
         """
         if self.sorting:
             return
+        if self.lane_view is not None:
+            messagebox.showinfo("Info", "Leave comparison mode to start a single sort.")
+            return
 
         if not self.data:
             if not self.parse_input():
@@ -676,13 +1027,19 @@ class InsertionSortVisualizer:
         self.sorting = True
         self.pause_button.config(state='normal')
         self.next_step_button.config(state='disabled')
+        self.prev_step_button.config(state='disabled')
         self.status_label.config(text="Sorting in progress...")
         self.comparisons = 0
         self.swaps = 0
         self.current_iteration = 0
         self.total_iterations = len(self.data)
+        # Work is every shift plus the final insert of each element
+        self.work_done = 0
+        self.total_work = count_inversions(self.data) + max(0, len(self.data) - 1)
+        self.progress_var.set(0)
         self.current_step_completed = True
-        self.step_history = []  # Clear step history
+        self.step_history.reset(self.data)  # Clear step history
+        self.history_base = 0
         
         # Initialize step counters
         self.current_step_number = 0
@@ -690,23 +1047,223 @@ class InsertionSortVisualizer:
         self.total_steps = 0
         self.total_substeps = 0
         
+        # Replay a loaded trace file, or a cached trace when this array was sorted before
+        if self.loaded_trace is not None and self.data == self.loaded_trace.initial_data:
+            self.trace = self.loaded_trace
+        else:
+            key = trace_key(self.data, verbose=not self.step_by_step)
+            self.trace = self.trace_cache.get(key)
+            if self.trace is None:
+                self.start_trace_worker(key, verbose=not self.step_by_step)
+        self.trace_pos = 0
+        self.display_data = self.data.copy()
+
         self.update_statistics()
         self.step_btn.config(state='disabled')  # Disable Step-by-Step when sorting starts
         if self.step_by_step:
             self.step_i = 1
             self.step_j = None
             self.step_current = None
-            self.step_mode = 'select'  # select, compare, shift, insert, complete
+            self.step_mode = 'select'  # name of the last played event, see OP_NAMES
             self.paused = True
             self.pause_button.config(text="Resume", state='disabled')
             self.next_step_button.config(state='normal')
+            self.prev_step_button.config(state='normal')
             self.step_by_step_sort()
         else:
             self.step_by_step = False  # disable step-by-step if normal sorting
             self.next_step_button.config(state='disabled')
+            self.prev_step_button.config(state='disabled')
             self.pause_button.config(text="Pause", state='normal')
             self.insertion_sort(1)
 
+    # Save trace
+    def save_trace(self):
+        """
+        Write the trace of the current array to a file.
+        """
+        data = self.initial_data if self.initial_data is not None else self.data
+        if not data:
+            messagebox.showwarning("Warning", "Enter or generate an array first.")
+            return
+        path = filedialog.asksaveasfilename(title="Save Trace",
+                                            defaultextension=".isvt",
+                                            filetypes=[("Sort traces", "*.isvt"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            trace = self.trace_cache.get_or_build(data)
+            count = write_trace(path, data, trace)
+            self.status_label.config(text=f"Trace saved: {count} steps")
+        except Exception as e:
+            print(f"Error saving trace: {str(e)}")
+            messagebox.showerror("Error", f"Failed to save trace: {str(e)}")
+
+    # Load trace
+    def load_trace(self):
+        """
+        Memory-map a trace file and show its initial array.
+        """
+        if self.sorting:
+            messagebox.showwarning("Warning", "Cannot load a trace while sorting is in progress.")
+            return
+        path = filedialog.askopenfilename(title="Load Trace",
+                                          filetypes=[("Sort traces", "*.isvt"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            trace = MappedTrace(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Failed to load trace: {str(e)}")
+            return
+        if trace.variant not in self.PLAYABLE_VARIANTS:
+            trace.close()
+            messagebox.showerror("Error", f"Cannot play {trace.variant} sort traces; "
+                                          "only insertion and binary insertion sort are supported.")
+            return
+        self.close_loaded_trace()
+        self.loaded_trace = trace
+        self.records = None
+        self.reset()
+        self.data = trace.initial_data.copy()
+        self.initial_data = self.data.copy()
+        self.animation_colors = None
+        self.current_step = None
+        self.show_data()
+        self.status_label.config(text=f"Trace loaded: {len(trace)} steps, "
+                                      f"{trace.comparisons} comparisons, {trace.swaps} swaps")
+
+    # Save session
+    def save_session(self):
+        """
+        Snapshot the whole session, including its trace, to a file.
+        """
+        data = self.initial_data if self.initial_data is not None else self.data
+        if not data:
+            messagebox.showwarning("Warning", "Enter or generate an array first.")
+            return
+        path = filedialog.asksaveasfilename(title="Save Session",
+                                            defaultextension=".isvs",
+                                            filetypes=[("Sessions", "*.isvs"), ("All files", "*.*")])
+        if not path:
+            return
+        verbose = not self.step_by_step
+        if self.sorting and self.trace_worker is None and self.trace is not None:
+            trace = self.trace
+            verbose = getattr(trace, 'verbose', verbose)
+        else:
+            trace = self.trace_cache.get_or_build(data, verbose=verbose)
+        if isinstance(trace, MappedTrace) and os.path.abspath(trace.path) == os.path.abspath(path):
+            # Saving over the mapped file: keep the events in memory instead
+            trace = list(trace)
+            if self.trace is self.loaded_trace:
+                self.trace = trace
+            self.close_loaded_trace()
+        if self.sorting and not self.paused and not self.step_by_step:
+            self.toggle_pause()
+        speed_name = next((value for _, value, speed in self.SPEEDS if speed == self.speed), "normal")
+        state = SessionState(
+            initial_data=list(data), data=list(self.data) if self.sorting else list(data),
+            dark_theme=self.is_dark_theme, sorting=self.sorting,
+            step_by_step=self.step_by_step, verbose=verbose,
+            speed=self.speed, speed_name=speed_name,
+            trace_pos=self.trace_pos if self.sorting else 0,
+            comparisons=self.comparisons, swaps=self.swaps,
+            current_iteration=self.current_iteration, total_iterations=self.total_iterations,
+            step_i=self.step_i, step_j=self.step_j, step_current=self.step_current,
+            step_op=OP_CODES.get(self.step_mode) if self.sorting else None,
+            current_step_number=self.current_step_number, current_substep=self.current_substep,
+            work_done=self.work_done, total_work=self.total_work, records=self.records)
+        try:
+            write_session(path, state, trace)
+            self.status_label.config(text="Session saved")
+        except Exception as e:
+            print(f"Error saving session: {str(e)}")
+            messagebox.showerror("Error", f"Failed to save session: {str(e)}")
+
+    # Load session
+    def load_session(self):
+        """
+        Restore a saved session at its saved trace position.
+        """
+        path = filedialog.askopenfilename(title="Load Session",
+                                          filetypes=[("Sessions", "*.isvs"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            state, trace = read_session(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Failed to load session: {str(e)}")
+            return
+        self.close_loaded_trace()
+        self.records = None
+        self.reset()
+        self.records = state.records
+        self.loaded_trace = trace
+        if state.dark_theme != self.is_dark_theme:
+            self.toggle_theme()
+        for text, value, speed in self.SPEEDS:
+            if value == state.speed_name:
+                self.speed_var.set(value)
+                self.set_speed(speed, text)
+        self.speed = state.speed
+        self.initial_data = state.initial_data
+        self.data = state.data
+        self.display_data = self.data.copy()
+        self.bar_geometry = None
+        self.bar_scale = None
+        self.step_by_step = state.step_by_step
+        if not state.sorting:
+            self.step_btn.config(state='normal')
+            self.show_data()
+            self.status_label.config(text="Session restored")
+            return
+
+        # Jump straight to the saved position in the mapped trace
+        self.trace = trace
+        self.trace_pos = state.trace_pos
+        self.comparisons = state.comparisons
+        self.swaps = state.swaps
+        self.current_iteration = state.current_iteration
+        self.total_iterations = state.total_iterations
+        self.work_done = state.work_done
+        self.total_work = state.total_work
+        self.step_i = state.step_i
+        self.step_j = state.step_j
+        self.step_current = state.step_current
+        self.step_mode = OP_NAMES.get(state.step_op)
+        self.current_step_number = state.current_step_number
+        self.current_substep = state.current_substep
+        self.total_steps = state.current_step_number
+        self.total_substeps = state.current_substep
+        # History starts at the restored position, not at the trace start
+        self.step_history.reset(self.data)
+        self.history_base = self.trace_pos
+        self.sorting = True
+        self.paused = True
+        self.step_btn.config(state='disabled')
+        if self.trace_pos > 0:
+            last = TraceStep(trace[self.trace_pos - 1], self.step_current)
+            self.animation_colors = last.positions()
+            self.current_animation = last.description(self.bar_label)
+        if self.step_by_step:
+            self.pause_button.config(text="Resume", state='disabled')
+            self.next_step_button.config(state='normal')
+            self.prev_step_button.config(state='normal')
+        else:
+            self.pause_button.config(text="Resume", state='normal')
+            self.resume_iteration = trace[self.trace_pos][1] if self.trace_pos < len(trace) else self.current_iteration
+        self.draw_bars(self.display_data, self.animation_colors)
+        self.status_label.config(text="Session restored - press " +
+                                      ("'Next Step'" if self.step_by_step else "'Resume'") + " to continue")
+        self.update_statistics()
+
+    # Close trace
+    def close_loaded_trace(self):
+        if self.loaded_trace is not None:
+            self.loaded_trace.close()
+            self.loaded_trace = None
+
     # Pause
     def toggle_pause(self):
         """
@@ -725,9 +1282,11 @@ class InsertionSortVisualizer:
                 self.animate_frame()
             elif self.animation_queue:
                 self.process_animation_queue()
-            else:
-                # If nothing is animating or queued, continue sorting
-                self.insertion_sort(self.current_iteration)
+            # Restart the sort if it went idle while paused
+            if self.resume_iteration is not None:
+                i = self.resume_iteration
+                self.resume_iteration = None
+                self.insertion_sort(i)
 
     # Step by step mode
     def toggle_step_by_step(self):
@@ -745,6 +1304,103 @@ class InsertionSortVisualizer:
             self.status_label.config(text="Step-by-Step mode disabled")
             self.pause_button.config(text="Pause", state='normal')
             self.next_step_button.config(state='disabled')
+            self.prev_step_button.config(state='disabled')
+
+    # Compare mode
+    def toggle_compare_mode(self):
+        """
+        Sort several orderings of the array side by side.
+        """
+        if self.sorting:
+            messagebox.showinfo("Info", "Cannot compare inputs while sorting is in progress.")
+            return
+        if self.lane_view is not None or self.race_precompute is not None:
+            self.stop_compare_mode()
+            self.status_label.config(text="Comparison mode closed")
+            return
+        data = self.initial_data if self.initial_data else self.data
+        if not data:
+            data = [random.randint(10, 100) for _ in range(20)]
+        lanes = []
+        for name, lane_data in lane_inputs(data):
+            lanes.append(SortLane(name, lane_data, self.trace_cache.get_or_build(lane_data)))
+        self.clear_canvas()
+        self.lane_view = LaneView(self.canvas, self.scheduler, self.colors,
+                                  interval_ms=max(16, self.speed // 10),
+                                  text_color=self.colors['text'])
+        self.lane_view.set_lanes(lanes)
+        self.lane_view.start()
+        self.compare_btn.config(text="Exit Compare")
+        self.status_label.config(text="Comparing how input order changes insertion sort's cost")
+
+    # Race mode
+    def toggle_race_mode(self):
+        """
+        Race insertion, binary insertion and Shell sort on the same array.
+        """
+        if self.sorting:
+            messagebox.showinfo("Info", "Cannot start a race while sorting is in progress.")
+            return
+        if self.lane_view is not None or self.race_precompute is not None:
+            self.stop_compare_mode()
+            self.status_label.config(text="Race closed")
+            return
+        data = self.initial_data if self.initial_data else self.data
+        if not data:
+            data = [random.randint(10, 100) for _ in range(20)]
+        try:
+            self.race_precompute = TracePrecompute(data, self.trace_cache)
+        except Exception as e:
+            print(f"Error starting race: {str(e)}")
+            messagebox.showerror("Error", "Failed to start the race")
+            return
+        self.race_btn.config(text="Exit Race")
+        self.status_label.config(text="Preparing race traces...")
+        self.poll_race()
+
+    # Race poll
+    def poll_race(self):
+        """
+        Start playback once every algorithm's trace is ready.
+        """
+        self.race_job = None
+        precompute = self.race_precompute
+        if precompute is None:
+            return
+        try:
+            ready = precompute.done()
+        except Exception as e:
+            print(f"Error computing race traces: {str(e)}")
+            messagebox.showerror("Error", "Failed to compute the race traces")
+            self.stop_compare_mode()
+            return
+        if not ready:
+            self.race_job = self.scheduler.call_later(50, self.poll_race)
+            return
+        self.race_precompute = None
+        self.clear_canvas()
+        self.lane_view = RaceView(self.canvas, self.scheduler, self.colors,
+                                  interval_ms=max(16, self.speed // 10),
+                                  text_color=self.colors['text'])
+        self.lane_view.set_lanes(precompute.lanes())
+        self.lane_view.start()
+        self.status_label.config(text="Race: every lane advances by the same number of comparisons")
+
+    # Compare stop
+    def stop_compare_mode(self):
+        self.scheduler.cancel(self.race_job)
+        self.race_job = None
+        if self.race_precompute is not None:
+            self.race_precompute.shutdown()
+            self.race_precompute = None
+        self.race_btn.config(text="Race")
+        self.compare_btn.config(text="Compare Inputs")
+        if self.lane_view is None:
+            return
+        self.lane_view.stop()
+        self.lane_view = None
+        if self.display_data:
+            self.draw_bars(self.display_data, self.animation_colors)
 
     # Theme
     def toggle_theme(self):
@@ -753,46 +1409,28 @@ class InsertionSortVisualizer:
         """
         try:
             self.is_dark_theme = not self.is_dark_theme
-            self.configure_style()  # Update colors based on theme
-            self.canvas.config(bg="#3B4252" if self.is_dark_theme else "#ECEFF4")
-            self.status_label.config(foreground="#A3BE8C" if self.is_dark_theme else "#2E3440")
-            if self.data:  # Redraw with new theme
-                self.draw_bars(self.data, self.animation_colors)
+            theme = THEMES[self.theme_name()]
+            self.colors = theme['colors']
+            self.color_lut = self.color_luts[self.theme_name()]
+            # One style swap plus one itemconfig per tag group, no redraw
+            self.style.theme_use(self.TTK_THEMES[self.theme_name()])
+            self.canvas.config(bg=theme['canvas_bg'])
+            self.status_label.config(foreground=theme['status_fg'])
+            self.canvas.itemconfig("grid", fill=theme['grid'])
+            for state in BAR_STATES:
+                self.canvas.itemconfig(f"st_{state}", fill=self.colors[state])
+            self.bar_fills = [self.colors[state] for state in self.bar_states]
+            self.canvas.itemconfig("label", fill=self.colors['text'])
+            self.canvas.itemconfig("label_bg", fill=self.colors['text_bg'])
+            if self.lane_view is not None:
+                self.lane_view.colors = self.colors
+                self.lane_view.text_color = self.colors['text']
+                if not self.lane_view.running:
+                    self.lane_view.render()
         except Exception as e:
             print(f"Error toggling theme: {str(e)}")
             messagebox.showerror("Error", "Failed to switch theme")
 
-    # Color mix
-    def interpolate_color(self, color1, color2, factor):
-        """
-        Mix two colors.
-        """
-        # Check cache first
-        cache_key = (color1, color2, factor)
-        if cache_key in self._cached_colors:
-            return self._cached_colors[cache_key]
-
-        # Convert hex colors to RGB
-        def hex_to_rgb(hex_color):
-            hex_color = hex_color.lstrip('#')
-            return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-
-        def rgb_to_hex(rgb):
-            return '#{:02x}{:02x}{:02x}'.format(int(rgb[0]), int(rgb[1]), int(rgb[2]))
-
-        # Convert colors to RGB
-        rgb1 = hex_to_rgb(color1)
-        rgb2 = hex_to_rgb(color2)
-
-        # Interpolate each component
-        r = rgb1[0] + (rgb2[0] - rgb1[0]) * factor
-        g = rgb1[1] + (rgb2[1] - rgb1[1]) * factor
-        b = rgb1[2] + (rgb2[2] - rgb1[2]) * factor
-
-        result = rgb_to_hex((r, g, b))
-        self._cached_colors[cache_key] = result
-        return result
-
     # Easing
     def ease_in_out_quad(self, t):
         """
@@ -801,30 +1439,10 @@ class InsertionSortVisualizer:
         return t * t * (3 - 2 * t)
 
     # Queue anim
-    def queue_animation(self, start_data, end_data, colors, animation_type, step_description=None):
+    def queue_animation(self, step):
         """
         Add animation step.
         """
-        # Ensure colors are properly copied and maintained
-        colors_copy = {}
-        for key, value in colors.items():
-            if isinstance(value, list):
-                colors_copy[key] = value.copy()
-            else:
-                colors_copy[key] = value
-
-        # Create deep copies of the data
-        start_data_copy = start_data.copy()
-        end_data_copy = end_data.copy()
-
-        animation = {
-            'start_data': start_data_copy,
-            'end_data': end_data_copy,
-            'colors': colors_copy,
-            'type': animation_type,
-            'step': step_description
-        }
-        
         # Store step in history for step-by-step mode
         if self.step_by_step:
             # Increment step counters before storing history
@@ -832,21 +1450,14 @@ class InsertionSortVisualizer:
             self.current_substep += 1
             self.total_steps = max(self.total_steps, self.current_step_number)
             self.total_substeps = max(self.total_substeps, self.current_substep)
-            
-            self.step_history.append({
-                'data': start_data_copy,
-                'step_i': getattr(self, 'step_i', 0),
-                'step_j': getattr(self, 'step_j', 0),
-                'step_current': getattr(self, 'step_current', 0),
-                'step_mode': getattr(self, 'step_mode', ''),
-                'step_number': self.current_step_number,
-                'substep': self.current_substep,
-                'comparisons': self.comparisons,
-                'swaps': self.swaps,
-                'description': step_description
-            })
-        
-        self.animation_queue.append(animation)
+
+            self.step_history.append(HistoryEntry(step,
+                                                  self.current_step_number,
+                                                  self.current_substep,
+                                                  self.comparisons,
+                                                  self.swaps))
+
+        self.animation_queue.append(step)
         self.step_count += 1
         self.update_statistics()
         
@@ -858,6 +1469,7 @@ class InsertionSortVisualizer:
         """
         Run next animation.
         """
+        self.frame_job = None
         if not self.animation_queue:
             self.is_animating = False
             # Don't automatically continue in step-by-step mode
@@ -865,27 +1477,30 @@ class InsertionSortVisualizer:
             return
 
         self.is_animating = True
-        animation = self.animation_queue.pop(0)
-        self.animate_transition(
-            animation['start_data'],
-            animation['end_data'],
-            animation['colors'],
-            animation['type'],
-            animation['step']
-        )
+        self.animate_transition(self.animation_queue.popleft())
 
     # Animate
-    def animate_transition(self, start_data, end_data, colors, animation_type, step_description=None):
+    def animate_transition(self, step):
         """
         Animate data.
         """
-        self.animation_data = (start_data, end_data)
-        self.animation_colors = colors
-        self.animation_type = animation_type
+        step_description = step.description(self.bar_label)
+        # Progress follows what is shown, not what is queued
+        if step.is_move:
+            self.work_done += 1
+            self.update_statistics()
+        elif step.event[0] == OP_DONE:
+            self.work_done = self.total_work
+            self.update_statistics()
+        self.animation_move = step.move()
+        self.animation_colors = step.positions()
+        # Bars fade from what is on screen now to the step's colors
+        self.fade_from = list(self.bar_states)
+        self.fade_factor = 0.0
+        self.animation_type = "move" if step.is_move else "color"
         self.current_frame = 0
         self.current_animation = step_description
-        if step_description:
-            self.current_step = step_description
+        self.current_step = step_description
         self.animate_frame()
 
     # Frame
@@ -893,21 +1508,28 @@ class InsertionSortVisualizer:
         """
         Draw animation frame.
         """
+        self.frame_job = None
         if self.paused and not self.step_by_step:
             return
             
         if self.current_frame >= self.animation_frames:
-            self.draw_bars(self.animation_data[1], self.animation_colors)
+            # Land the moved value in the live buffer
+            if self.animation_move is not None:
+                from_index, to_index, value = self.animation_move
+                self.display_data[to_index] = value
+                self.end_slide(to_index)
+            self.fade_factor = 1.0
+            self.draw_bars(self.display_data, self.animation_colors)
             self.current_step_completed = True
             
             if self.step_by_step:
                 self.paused = True
                 # Ensure we show the final state before moving to next step
-                self.draw_bars(self.animation_data[1], self.animation_colors)
+                self.draw_bars(self.display_data, self.animation_colors)
                 # Don't automatically continue to next iteration in step-by-step mode
                 # Let the user control it with the next button
             elif not self.paused:
-                self.root.after(50, self.process_animation_queue)
+                self.schedule_frame(50, self.process_animation_queue)
             return
 
         # Frame rate limiting
@@ -915,218 +1537,200 @@ class InsertionSortVisualizer:
         elapsed = current_time - self._last_draw_time
         if elapsed < self._min_frame_time:
             if not self.paused or self.step_by_step:
-                self.root.after(int(self._min_frame_time - elapsed), self.animate_frame)
+                self.schedule_frame(self._min_frame_time - elapsed, self.animate_frame)
             return
+        if self.current_frame > 0 and elapsed < 250:
+            # Smoothed frame time for the ETA; gaps between steps are skipped
+            self.frame_time += (elapsed - self.frame_time) * 0.1
 
-        start_data, end_data = self.animation_data
         factor = self.current_frame / self.animation_frames
 
-        # Interpolate between start and end positions
-        current_data = []
-        for i in range(len(start_data)):
-            if self.animation_type == "move":
-                # Use easing function for smoother movement
-                eased_factor = self.ease_in_out_quad(factor)
-                current_data.append(start_data[i] + (end_data[i] - start_data[i]) * eased_factor)
+        if self.animation_move is not None:
+            # Only the moved bar slides; every other bar stays untouched
+            if self.current_frame == 0:
+                self.start_slide()
             else:
-                current_data.append(start_data[i] + (end_data[i] - start_data[i]) * factor)
-
-        # Use the same color positions throughout the animation
-        self.draw_bars(current_data, self.animation_colors)
+                self.slide(self.ease_in_out_quad(factor))
+        else:
+            # Use the same color positions throughout the animation
+            self.fade_factor = self.ease_in_out_quad(factor)
+            self.draw_bars(self.display_data, self.animation_colors)
         self.current_frame += 1
         self._last_draw_time = current_time
         
         # Calculate next frame delay based on speed
         next_frame_delay = int(self._min_frame_time * self.animation_speed_factor)
         if not self.paused or self.step_by_step:
-            self.root.after(next_frame_delay, self.animate_frame)
+            self.schedule_frame(next_frame_delay, self.animate_frame)
+
+    # Slide start
+    def start_slide(self):
+        """
+        Draw the moved value at its target slot, then shift that bar and
+        its label back over the source slot, ready to slide.
+        """
+        from_index, to_index, value = self.animation_move
+        self.display_data[to_index] = value
+        self.fade_factor = 1.0
+        self.draw_bars(self.display_data, self.animation_colors)
+        self.slide_state = None
+        if not self.bar_items or from_index == to_index:
+            return
+        text_item, bg_item = self.label_items[to_index]
+        for item in (self.bar_items[to_index], bg_item, text_item):
+            self.canvas.addtag_withtag("sliding", item)
+        self.canvas.tag_raise("sliding")
+        geometry = self.bar_layout
+        distance = geometry.x0[from_index] - geometry.x0[to_index]
+        self.canvas.move("sliding", distance, 0)
+        self.slide_state = [distance, distance, self.bar_layout]
+
+    # Slide
+    def slide(self, eased_factor):
+        """
+        One move frame: a single canvas.move of the sliding group.
+        """
+        state = self.slide_state
+        if state is None or state[2] != self.bar_layout:
+            return
+        distance, offset, layout = state
+        target = distance * (1 - eased_factor)
+        self.canvas.move("sliding", target - offset, 0)
+        state[1] = target
+
+    # Slide end
+    def end_slide(self, to_index):
+        self.canvas.dtag("sliding", "sliding")
+        self.slide_state = None
+        # Let draw_bars place the bar exactly in its slot again
+        if to_index < len(self.bar_values):
+            self.bar_values[to_index] = None
+
+    # Schedule frame
+    def schedule_frame(self, delay, callback):
+        """
+        Queue the next animation callback, replacing any pending one.
+        """
+        self.scheduler.cancel(self.frame_job)
+        self.frame_job = self.scheduler.call_later(delay, callback)
 
     # Sort step
     def insertion_sort(self, i):
         """
         Do one sort step.
         """
+        self.sort_job = None
         if not self.sorting:
             return
 
-        if i >= len(self.data):
-            self.queue_animation(
-                self.data.copy(), 
-                self.data.copy(),
-                {"sorted": list(range(len(self.data)))},
-                "color",
-                "Sorting Complete"
-            )
-            self.status_label.config(text=f"Sorted: {self.data}")
-            self.sorting = False
-            self.pause_button.config(state='disabled')
-            self.next_step_button.config(state='disabled')
-            self.step_btn.config(state='normal')  # Enable Step-by-Step after sorting
-            return
-
         if self.paused and not self.step_by_step:
-            self.root.after(100, lambda: self.insertion_sort(i))
+            # Stay idle until toggle_pause resumes from here
+            self.resume_iteration = i
             return
 
-        current = self.data[i]
-        j = i - 1
         self.current_iteration = i
         self.current_step_completed = False
         self.update_statistics()
 
-        # Step 1: Highlight current element
-        step_desc = f"Step {i}: Selecting element {current} at position {i}"
-        self.queue_animation(
-            self.data.copy(),
-            self.data.copy(),
-            {"current": [i], "sorted": list(range(i))},
-            "color",
-            step_desc
-        )
-
-        if self.step_by_step:
-            self.paused = True
-            self.status_label.config(text=step_desc)
-            return
-
-        # Step 2: Start comparison loop
-        while j >= 0:
-            self.comparisons += 1
-            self.update_statistics()
-
-            # Step 2.1: Show comparison
-            step_desc = f"Step {i}.{j}: Comparing {current} with {self.data[j]} at position {j}"
-            self.queue_animation(
-                self.data.copy(),
-                self.data.copy(),
-                {"current": [i], "compare": [j], "sorted": list(range(i))},
-                "color",
-                step_desc
-            )
-
-            if self.step_by_step:
-                self.paused = True
-                self.status_label.config(text=step_desc)
+        # Replay every recorded event of iteration i
+        while self.trace_pos < len(self.trace) or self.trace_worker is not None:
+            if self.trace_pos >= len(self.trace):
+                # Wait for the worker to hand over more events
+                self.schedule_sort(self.TRACE_POLL_MS, lambda: self.insertion_sort(i))
                 return
-
-            # Step 2.2: Check if we need to shift
-            if self.data[j] > current:
-                # Step 2.2.1: Show that we need to shift
-                step_desc = f"Step {i}.{j}: {self.data[j]} > {current}, need to shift {self.data[j]} right"
-                self.queue_animation(
-                    self.data.copy(),
-                    self.data.copy(),
-                    {"current": [i], "compare": [j], "sorted": list(range(i))},
-                    "color",
-                    step_desc
-                )
-
-                if self.step_by_step:
-                    self.paused = True
-                    self.status_label.config(text=step_desc)
-                    return
-
-                # Step 2.2.2: Perform the shift
-                new_data = self.data.copy()
-                new_data[j + 1] = self.data[j]
-                step_desc = f"Step {i}.{j}: Shifting {self.data[j]} from position {j} to {j+1}"
-                self.queue_animation(
-                    self.data.copy(),
-                    new_data,
-                    {"current": [i], "compare": [j], "sorted": list(range(i))},
-                    "move",
-                    step_desc
-                )
-
-                if self.step_by_step:
-                    self.paused = True
-                    self.status_label.config(text=step_desc)
-                    return
-
-                # Step 2.2.3: Update the data
-                self.data[j + 1] = self.data[j]
-                j -= 1
-                self.swaps += 1
-                self.update_statistics()
-            else:
-                # Step 2.3: Show that we found the correct position
-                step_desc = f"Step {i}.{j}: {self.data[j]} <= {current}, found insertion point"
-                self.queue_animation(
-                    self.data.copy(),
-                    self.data.copy(),
-                    {"current": [i], "compare": [j], "sorted": list(range(i))},
-                    "color",
-                    step_desc
-                )
+            event = self.trace[self.trace_pos]
+            if event[1] != i:
                 break
-
-            if self.step_by_step:
-                self.paused = True
-                self.status_label.config(text=step_desc)
+            self.trace_pos += 1
+            self.play_trace_event(event)
+            if event[0] == OP_DONE:
+                self.finish_sort(f"Sorted: {self.data_text()}")
                 return
 
-            if self.paused and not self.step_by_step:
-                self.root.after(100, lambda: self.insertion_sort(i))
-                return
+        # Continue with next element
+        self.schedule_sort(self.speed, lambda: self.insertion_sort(i + 1))
 
-        # Step 3: Show insertion point
-        step_desc = f"Step {i}.{j+1}: Found insertion point at position {j+1} for element {current}"
-        self.queue_animation(
-            self.data.copy(),
-            self.data.copy(),
-            {"current": [i], "insert": [j + 1], "sorted": list(range(i))},
-            "color",
-            step_desc
-        )
+    # Schedule
+    def schedule_sort(self, delay, callback):
+        """
+        Run the next sort step after delay, replacing any pending one.
+        """
+        self.scheduler.cancel(self.sort_job)
+        self.sort_job = self.scheduler.call_later(delay, callback)
 
-        if self.step_by_step:
-            self.paused = True
-            self.status_label.config(text=step_desc)
+    # Worker start
+    def start_trace_worker(self, key, verbose):
+        """
+        Generate the trace on a background thread.
+        """
+        self.cancel_trace_worker()
+        self.trace_worker = TraceWorker(self.data, verbose=verbose).start()
+        self.trace_worker_key = key
+        self.trace = self.trace_worker.events
+        self.trace_poll_job = self.scheduler.call_later(self.TRACE_POLL_MS, self.poll_trace_worker)
+
+    # Worker poll
+    def poll_trace_worker(self):
+        """
+        Pull finished event batches onto the Tk thread.
+        """
+        self.trace_poll_job = None
+        worker = self.trace_worker
+        if worker is None:
             return
-
-        # Step 4: Insert the current element
-        new_data = self.data.copy()
-        new_data[j + 1] = current
-        step_desc = f"Step {i}.{j+1}: Inserting {current} at position {j+1}"
-        self.queue_animation(
-            self.data.copy(),
-            new_data,
-            {"current": [i], "insert": [j + 1], "sorted": list(range(i))},
-            "move",
-            step_desc
-        )
-
-        if self.step_by_step:
-            self.paused = True
-            self.status_label.config(text=step_desc)
+        if not worker.drain():
+            self.trace_poll_job = self.scheduler.call_later(self.TRACE_POLL_MS, self.poll_trace_worker)
             return
-
-        # Step 5: Update the data
-        self.data[j + 1] = current
-        self.swaps += 1
-        self.update_statistics()
-
-        # Step 6: Show completion
-        step_desc = f"Step {i}: Completed insertion of {current} at position {j+1}"
-        self.queue_animation(
-            self.data.copy(),
-            self.data.copy(),
-            {"sorted": list(range(i + 1))},
-            "color",
-            step_desc
-        )
-
-        if self.step_by_step:
-            self.paused = True
-            self.status_label.config(text=step_desc)
-            # Ensure we show the final state before moving to next iteration
-            self.draw_bars(self.data.copy(), {"sorted": list(range(i + 1))})
-            # Move to next iteration after completing current element
-            self.current_iteration = i + 1
+        self.trace_worker = None
+        if worker.error is not None:
+            print(f"Error generating trace: {str(worker.error)}")
+            messagebox.showerror("Error", "Failed to generate the sort trace")
+            self.reset()
             return
+        self.trace_cache.put(self.trace_worker_key, worker.events)
+
+    # Worker stop
+    def cancel_trace_worker(self):
+        self.scheduler.cancel(self.trace_poll_job)
+        self.trace_poll_job = None
+        if self.trace_worker is not None:
+            self.trace_worker.cancel()
+            self.trace_worker = None
+
+    # Trace event
+    def play_trace_event(self, event):
+        """
+        Queue the animation for one trace event.
+        """
+        op, i, j, value = event
+        self.step_i = i
+        self.step_j = j
+        self.step_mode = OP_NAMES[op]
+        if op == OP_SELECT:
+            self.step_current = value
+            self.current_iteration = i
+        elif op == OP_COMPARE:
+            self.comparisons += 1
 
-        # Continue with next element
-        self.root.after(self.speed, lambda: self.insertion_sort(i + 1))
+        apply_event(self.data, event)
+        step = TraceStep(event, self.step_current)
+        self.queue_animation(step)
+        if step.is_move:
+            self.swaps += 1
+            self.update_statistics()
+        return step
+
+    # Finish
+    def finish_sort(self, message):
+        """
+        Leave sorting state.
+        """
+        self.status_label.config(text=message)
+        self.sorting = False
+        self.pause_button.config(state='disabled')
+        self.next_step_button.config(state='disabled')
+        self.prev_step_button.config(state='disabled')
+        self.step_btn.config(state='normal')  # Enable Step-by-Step after sorting
 
     # Resize
     def on_canvas_resize(self, event):
@@ -1137,10 +1741,16 @@ class InsertionSortVisualizer:
             # Update canvas dimensions
             self.canvas_width = max(100, event.width)  # Ensure minimum width
             self.canvas_height = max(100, event.height)  # Ensure minimum height
+            self.bar_geometry = None  # rebuilt for the new size with the same scale
             
             # Redraw if we have data
-            if self.data:
-                self.root.after(100, lambda: self.draw_bars(self.data, self.animation_colors))
+            if self.lane_view is not None:
+                self.scheduler.cancel(self.resize_job)
+                self.resize_job = self.scheduler.call_later(100, self.lane_view.render)
+            elif self.display_data:
+                self.scheduler.cancel(self.resize_job)
+                self.resize_job = self.scheduler.call_later(
+                    100, lambda: self.draw_bars(self.display_data, self.animation_colors))
         except Exception as e:
             print(f"Error during canvas resize: {str(e)}")
 
@@ -1160,198 +1770,123 @@ class InsertionSortVisualizer:
             # If no animations, advance to next step
             self.step_by_step_sort()
 
+    # Prev
+    def prev_step(self):
+        """
+        Go back one step, restoring the array and counters from history.
+        """
+        if not self.sorting or not self.step_by_step or len(self.step_history) < 2:
+            return
+
+        self.step_history.pop()
+        entry = self.step_history[-1]
+        op, i, j, value = entry.step.event
+        self.data = self.step_history.state_at(-1)
+        self.display_data = self.data.copy()
+        self.trace_pos = self.history_base + len(self.step_history)
+        self.step_i = i
+        self.step_j = j
+        self.step_current = entry.step.current
+        self.step_mode = OP_NAMES[op]
+        if op == OP_SELECT:
+            self.current_iteration = i
+        # Swaps are counted after a move step is queued
+        self.comparisons = entry.comparisons
+        self.swaps = entry.swaps + (1 if entry.step.is_move else 0)
+        self.current_step_number = entry.step_number
+        self.current_substep = entry.substep
+        self.work_done = self.swaps
+
+        # Show the restored step without animating it
+        self.animation_queue.clear()
+        self.scheduler.cancel(self.frame_job)
+        self.frame_job = None
+        self.is_animating = False
+        if self.slide_state is not None and self.animation_move is not None:
+            # Put the half-slid bar and label back in their slot
+            self.end_slide(self.animation_move[1])
+        self.animation_move = None
+        self.fade_from = None
+        self.fade_factor = 1.0
+        self.current_step_completed = True
+        self.paused = True
+        self.animation_colors = entry.step.positions()
+        self.current_animation = entry.description(self.bar_label)
+        self.current_step = self.current_animation
+        self.draw_bars(self.display_data, self.animation_colors)
+        self.status_label.config(text=self.current_animation)
+        self.update_statistics()
+
     # Step sort
     def step_by_step_sort(self):
         """
         Step-by-step sort.
         """
-        # If sorting is done
-        if not self.sorting or self.step_i >= len(self.data):
-            self.queue_animation(
-                self.data.copy(),
-                self.data.copy(),
-                {"sorted": list(range(len(self.data)))},
-                "color",
-                "Sorting Complete"
-            )
-            self.status_label.config(text=f"Sorting Complete! Final array: {self.data}")
-            self.sorting = False
-            self.pause_button.config(state='disabled')
-            self.next_step_button.config(state='disabled')
-            self.step_btn.config(state='normal')  # Enable Step-by-Step after sorting
+        self.sort_job = None
+        if not self.sorting:
             return
 
-        # Step 1: Select current element
-        if self.step_mode == 'select':
-            self.step_current = self.data[self.step_i]
-            self.step_j = self.step_i - 1
-            self.current_iteration = self.step_i
-            
-            step_desc = f"Step {self.step_i}: Selecting element {self.step_current} at position {self.step_i}"
-            
-            # Queue animation instead of direct draw
-            self.queue_animation(
-                self.data.copy(),
-                self.data.copy(),
-                {"current": [self.step_i], "sorted": list(range(self.step_i))},
-                "color",
-                step_desc
-            )
-            
-            self.status_label.config(text=step_desc)
-            self.step_mode = 'compare'
+        if self.trace_pos >= len(self.trace):
+            # Wait for the worker to hand over more events
+            self.status_label.config(text="Preparing steps...")
+            self.schedule_sort(self.TRACE_POLL_MS, self.step_by_step_sort)
             return
 
-        # Step 2: Compare
-        if self.step_mode == 'compare':
-            if self.step_j >= 0:
-                self.comparisons += 1
-                
-                step_desc = f"Step {self.step_i}.{self.step_j}: Comparing {self.step_current} with {self.data[self.step_j]} at position {self.step_j}"
-                
-                # Queue animation instead of direct draw
-                self.queue_animation(
-                    self.data.copy(),
-                    self.data.copy(),
-                    {"current": [self.step_i], "compare": [self.step_j], "sorted": list(range(self.step_i))},
-                    "color",
-                    step_desc
-                )
-                
-                self.status_label.config(text=step_desc)
-                
-                if self.data[self.step_j] > self.step_current:
-                    self.step_mode = 'shift'
-                else:
-                    self.step_mode = 'insert_point'
-                return
-            else:
-                self.step_mode = 'insert_point'
-                self.step_by_step_sort()
-                return
-
-        # Step 3: Shift
-        if self.step_mode == 'shift':
-            step_desc = f"Step {self.step_i}.{self.step_j}: {self.data[self.step_j]} > {self.step_current}, need to shift {self.data[self.step_j]} right"
-            
-            # Queue animation instead of direct draw
-            self.queue_animation(
-                self.data.copy(),
-                self.data.copy(),
-                {"current": [self.step_i], "compare": [self.step_j], "sorted": list(range(self.step_i))},
-                "color",
-                step_desc
-            )
-            
-            self.status_label.config(text=step_desc)
-            self.step_mode = 'shift_move'
-            return
-            
-        if self.step_mode == 'shift_move':
-            # Create new data with the shift
-            new_data = self.data.copy()
-            new_data[self.step_j + 1] = self.data[self.step_j]
-            
-            step_desc = f"Step {self.step_i}.{self.step_j}: Shifting {self.data[self.step_j]} from position {self.step_j} to {self.step_j+1}"
-            
-            # Queue animation with movement
-            self.queue_animation(
-                self.data.copy(),
-                new_data,
-                {"current": [self.step_i], "compare": [self.step_j], "sorted": list(range(self.step_i))},
-                "move",
-                step_desc
-            )
-            
-            # Update the actual data
-            self.data[self.step_j + 1] = self.data[self.step_j]
-            self.swaps += 1
-            
-            self.status_label.config(text=step_desc)
-            self.step_j -= 1
-            self.step_mode = 'compare'
-            return
-
-        # Step 4: Insert point
-        if self.step_mode == 'insert_point':
-            step_desc = f"Step {self.step_i}.{self.step_j+1}: Found insertion point at position {self.step_j+1} for element {self.step_current}"
-            
-            # Queue animation instead of direct draw
-            self.queue_animation(
-                self.data.copy(),
-                self.data.copy(),
-                {"current": [self.step_i], "insert": [self.step_j + 1], "sorted": list(range(self.step_i))},
-                "color",
-                step_desc
-            )
-            
-            self.status_label.config(text=step_desc)
-            self.step_mode = 'insert'
-            return
-            
-        # Step 5: Insert
-        if self.step_mode == 'insert':
-            # Create new data with the insertion
-            new_data = self.data.copy()
-            new_data[self.step_j + 1] = self.step_current
-            
-            step_desc = f"Step {self.step_i}.{self.step_j+1}: Inserting {self.step_current} at position {self.step_j+1}"
-            
-            # Queue animation with movement
-            self.queue_animation(
-                self.data.copy(),
-                new_data,
-                {"current": [self.step_i], "insert": [self.step_j + 1], "sorted": list(range(self.step_i))},
-                "move",
-                step_desc
-            )
-            
-            # Update the actual data
-            self.data[self.step_j + 1] = self.step_current
-            self.swaps += 1
-            
-            self.status_label.config(text=step_desc)
-            self.step_mode = 'complete'
-            return
-            
-        # Step 6: Complete
-        if self.step_mode == 'complete':
-            step_desc = f"Step {self.step_i}: Completed insertion of {self.step_current} at position {self.step_j+1}"
-            
-            # Queue animation instead of direct draw
-            self.queue_animation(
-                self.data.copy(),
-                self.data.copy(),
-                {"sorted": list(range(self.step_i + 1))},
-                "color",
-                step_desc
-            )
-            
-            self.status_label.config(text=step_desc)
-            self.step_i += 1
-            self.step_mode = 'select'
-            return
+        # Play the next recorded event
+        event = self.trace[self.trace_pos]
+        self.trace_pos += 1
+        step = self.play_trace_event(event)
+        if event[0] == OP_DONE:
+            self.finish_sort(f"Sorting Complete! Final array: {self.data_text()}")
+        else:
+            self.status_label.config(text=step.description(self.bar_label))
 
     # Close
     def close_window(self):
         """
         Close the app.
         """
+        try:
+            if not messagebox.askokcancel("Quit", "Do you want to quit the application?"):
+                return
+        except Exception as e:
+            print(f"Error during window close: {str(e)}")
+        self.teardown()
+        self.root.destroy()
+
+    # Teardown
+    def teardown(self):
+        """
+        Stop everything that is running; only once quitting is confirmed.
+        """
         try:
             # Clear any pending animations
-            if hasattr(self, 'animation_timer') and self.animation_timer:
-                self.root.after_cancel(self.animation_timer)
-                self.animation_timer = None
-            
+            self.scheduler.clear()
+
             # Clear animation queue
             self.animation_queue.clear()
             self.is_animating = False
-            
-            if messagebox.askokcancel("Quit", "Do you want to quit the application?"):
-                self.root.destroy()
+            self.cancel_trace_worker()
+            self.close_loaded_trace()
+            self.step_history.clear()
+            self.close_playlist()
         except Exception as e:
             print(f"Error during window close: {str(e)}")
-            self.root.destroy()
+        self.finish_profiling()
+
+    # Profile
+    def finish_profiling(self):
+        """
+        Write the profiling reports, if this session is profiled.
+        """
+        profiler, self.profiler = self.profiler, None
+        if profiler is None:
+            return
+        try:
+            paths = profiler.finish()
+            print("Profile written to " + ", ".join(paths))
+        except Exception as e:
+            print(f"Error writing profile: {str(e)}")
 
 if __name__ == "__main__":
     main()
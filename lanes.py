@@ -0,0 +1,220 @@
+"""
+Lanes module for the Insertion Sort Visualizer.
+Sorts several inputs side by side on one canvas, each in its own lane,
+driven by a single frame clock and drawn in one pass per frame.
+"""
+
+import random
+from sort_trace import OP_COMPARE, OP_DONE, MOVE_OPS, TraceStep, apply_event
+
+LANE_HEADER = 20  # room for the lane's text above its bars
+
+
+# Inputs
+def lane_inputs(data):
+    """
+    Random, nearly sorted and reversed orderings of the same values,
+    plus the user's own order.
+    """
+    ordered = sorted(data)
+    shuffled = ordered.copy()
+    random.shuffle(shuffled)
+    nearly = ordered.copy()
+    if len(nearly) > 1:
+        for _ in range(max(1, len(nearly) // 10)):
+            k = random.randrange(len(nearly) - 1)
+            nearly[k], nearly[k + 1] = nearly[k + 1], nearly[k]
+    return [
+        ("User input", list(data)),
+        ("Random", shuffled),
+        ("Nearly sorted", nearly),
+        ("Reversed", ordered[::-1]),
+    ]
+
+
+class SortLane:
+    """
+    One input and the replay position within its trace.
+    """
+    def __init__(self, name, data, trace):
+        self.name = name
+        self.data = list(data)
+        self.trace = trace
+        self.pos = 0
+        self.comparisons = 0
+        self.swaps = 0
+        self.positions = None
+        self.done = not trace
+
+    # Advance
+    def advance(self, count=1):
+        """
+        Play up to count events; returns how many were played.
+        """
+        played = 0
+        while played < count and not self.done:
+            event = self.trace[self.pos]
+            self.pos += 1
+            played += 1
+            op = event[0]
+            if op == OP_COMPARE:
+                self.comparisons += 1
+            elif op in MOVE_OPS:
+                self.swaps += 1
+            apply_event(self.data, event)
+            self.positions = TraceStep(event, None).positions()
+            if op == OP_DONE or self.pos >= len(self.trace):
+                self.done = True
+        return played
+
+
+class LaneItems:
+    """
+    The canvas items of one lane and what they last showed.
+    """
+    def __init__(self, lane, text_item, bar_items, top, bottom, width):
+        self.text_item = text_item
+        self.text = None
+        self.text_color = None
+        self.bars = bar_items
+        self.values = [None] * len(bar_items)
+        self.fills = [None] * len(bar_items)
+        self.bottom = bottom
+        self.available = bottom - top - LANE_HEADER
+        self.max_val = max(lane.data, default=0) or 1  # a sort keeps the values
+        self.bar_width = (width - 40) / len(bar_items) if bar_items else 0
+        self.bar_span = max(1, self.bar_width - 2)
+
+
+class LaneView:
+    """
+    Draws all lanes on a canvas from one scheduler task per frame. The
+    items are created once per lane set and canvas size; frames only
+    move and recolor them.
+    """
+    # Init
+    def __init__(self, canvas, scheduler, colors, interval_ms=16, text_color="#ECEFF4"):
+        self.canvas = canvas
+        self.scheduler = scheduler
+        self.colors = colors
+        self.interval_ms = interval_ms
+        self.steps_per_frame = 1
+        self.text_color = text_color
+        self.lanes = []
+        self.running = False
+        self._job = None
+        self._items = []
+        self._layout = None
+
+    # Lanes
+    def set_lanes(self, lanes):
+        self.lanes = list(lanes)
+        self._layout = None
+        self.render()
+
+    # Start
+    def start(self):
+        self.running = True
+        self._schedule()
+
+    # Stop
+    def stop(self):
+        self.running = False
+        self.scheduler.cancel(self._job)
+        self._job = None
+        self.canvas.delete("lane")
+        self._items = []
+        self._layout = None
+
+    # Finished
+    def finished(self):
+        return all(lane.done for lane in self.lanes)
+
+    def _schedule(self):
+        self.scheduler.cancel(self._job)
+        self._job = self.scheduler.call_later(self.interval_ms, self._tick)
+
+    # Frame
+    def _tick(self):
+        self._job = None
+        if not self.running:
+            return
+        self.advance_lanes()
+        self.render()
+        if self.finished():
+            self.running = False
+        else:
+            self._schedule()
+
+    # Advance
+    def advance_lanes(self):
+        for lane in self.lanes:
+            lane.advance(self.steps_per_frame)
+
+    # Color
+    def _bar_color(self, index, positions):
+        if not positions:
+            return self.colors['default']
+        # The inserted bar lands inside the sorted prefix, so it goes first
+        for state in ('current', 'compare', 'insert', 'sorted'):
+            if index in positions.get(state, ()):
+                return self.colors[state]
+        return self.colors['default']
+
+    # Build
+    def _build(self, width, height):
+        """
+        Create the header text and bars of every lane.
+        """
+        canvas = self.canvas
+        canvas.delete("lane")
+        lane_height = height / len(self.lanes)
+        self._items = []
+        for index, lane in enumerate(self.lanes):
+            top = index * lane_height
+            bottom = top + lane_height - 6
+            text_item = canvas.create_text(20, top + 4, anchor="nw", fill=self.text_color,
+                                           font=("Segoe UI", 9, "bold"), tags="lane")
+            bars = [canvas.create_rectangle(0, 0, 0, 0, outline="", width=0, tags="lane")
+                    for _ in lane.data]
+            self._items.append(LaneItems(lane, text_item, bars, top, bottom, width))
+        self._layout = (width, height)
+
+    # Draw
+    def render(self):
+        """
+        Bring every lane's items up to date in one pass.
+        """
+        canvas = self.canvas
+        if not self.lanes:
+            canvas.delete("lane")
+            self._items = []
+            self._layout = None
+            return
+        width = canvas.winfo_width()
+        height = canvas.winfo_height()
+        if width <= 1 or height <= 1:
+            return
+        if self._layout != (width, height):
+            self._build(width, height)
+        for lane, items in zip(self.lanes, self._items):
+            status = "done" if lane.done else f"step {lane.pos}/{len(lane.trace)}"
+            text = f"{lane.name}   Comparisons: {lane.comparisons}   Swaps: {lane.swaps}   ({status})"
+            if text != items.text:
+                canvas.itemconfig(items.text_item, text=text)
+                items.text = text
+            if self.text_color != items.text_color:
+                canvas.itemconfig(items.text_item, fill=self.text_color)
+                items.text_color = self.text_color
+            positions = lane.positions
+            for i, val in enumerate(lane.data):
+                bar = items.bars[i]
+                color = self._bar_color(i, positions)
+                if color != items.fills[i]:
+                    canvas.itemconfig(bar, fill=color)
+                    items.fills[i] = color
+                if val != items.values[i]:
+                    x0 = 20 + i * items.bar_width
+                    y1 = items.bottom - (val / items.max_val * items.available)
+                    canvas.coords(bar, x0, items.bottom, x0 + items.bar_span, y1)
+                    items.values[i] = val
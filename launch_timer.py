@@ -0,0 +1,83 @@
+"""
+Launch timer module for the Insertion Sort Visualizer.
+Timestamps the launch path from process start to first paint to the first
+accepted click. Marks are always recorded; the report is only printed when
+ISV_LAUNCH_REPORT is set or the app is started with --launch-report.
+"""
+
+import os
+import sys
+import time
+
+LAUNCH_ENV = "ISV_LAUNCH_REPORT"
+LAUNCH_FLAG = "--launch-report"
+
+# Fallback origin when the process start time is not available
+_IMPORTED = time.perf_counter()
+
+
+# Process start
+def process_start():
+    """
+    When the process started, on the perf_counter clock, or None where
+    the OS does not tell us (only Linux is supported).
+    """
+    try:
+        with open("/proc/self/stat") as f:
+            # The command name may contain spaces, so split after it
+            fields = f.read().rsplit(")", 1)[1].split()
+        started = int(fields[19]) / os.sysconf("SC_CLK_TCK")
+        return time.perf_counter() - (time.clock_gettime(time.CLOCK_BOOTTIME) - started)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+# Requested
+def requested(argv=None):
+    """
+    Whether a launch report was asked for.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    value = os.environ.get(LAUNCH_ENV, "").strip()
+    return LAUNCH_FLAG in argv or (bool(value) and value != "0")
+
+
+class LaunchTimer:
+    """
+    Ordered (name, perf_counter) marks relative to process start.
+    """
+    def __init__(self):
+        start = process_start()
+        if start is None:
+            self.marks = [("module import", _IMPORTED)]
+        else:
+            self.marks = [("process start", start)]
+        self._names = set()
+
+    # Mark
+    def mark(self, name):
+        """
+        Record name once; later marks with the same name are ignored.
+        """
+        if name in self._names:
+            return False
+        self._names.add(name)
+        self.marks.append((name, time.perf_counter()))
+        return True
+
+    def __contains__(self, name):
+        return name in self._names
+
+    # Report
+    def report(self):
+        origin = self.marks[0][1]
+        lines = [f"{'mark':<28} {'since start ms':>15} {'delta ms':>10}"]
+        previous = origin
+        for name, at in self.marks:
+            lines.append(f"{name:<28} {(at - origin) * 1000:>15.1f} {(at - previous) * 1000:>10.1f}")
+            previous = at
+        return "\n".join(lines)
+
+    def print_report(self, file=None):
+        print("Launch timing", file=file or sys.stderr)
+        print(self.report(), file=file or sys.stderr)
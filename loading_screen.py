@@ -1,11 +1,13 @@
 """
 Loading screen module for the Insertion Sort Visualizer.
-Provides a smooth loading animation with progress bar.
+Provides a smooth loading animation with progress bar. The visualizer is
+built behind it in idle-time slices, so switching to it is a single pack.
 """
 
 import tkinter as tk
 import math
 import time
+from collections import deque
 from insertion_sort_visualizer import InsertionSortVisualizer
 import tkinter.messagebox as messagebox
 
@@ -75,11 +77,42 @@ class LoadingScreen(tk.Frame):
             "Almost there..."
         ]
         self.current_text_index = 0
+        self.visualizer = None
+        self.prebuild_steps = None
 
     # Anim start
     def _start_animations(self):
         self.simulate_loading()
         self.update_loading_text()
+        self.root.after_idle(self._prebuild_step)
+
+    # Prebuild
+    def _prebuild_step(self):
+        """
+        Build one piece of the visualizer, then yield to the event loop so
+        the progress animation keeps running.
+        """
+        if not self.winfo_exists():
+            return
+        try:
+            if self.visualizer is None:
+                self.visualizer = InsertionSortVisualizer(self.root, build=False)
+                self.prebuild_steps = deque(self.visualizer.ui_steps())
+            elif self.prebuild_steps:
+                self.prebuild_steps.popleft()()
+        except Exception as e:
+            print(f"Error preparing visualizer: {e}")
+            self._discard_prebuilt()
+            return
+        if self.prebuild_steps:
+            self.root.after_idle(self._prebuild_step)
+
+    def _discard_prebuilt(self):
+        # Fall back to building the visualizer at hand-off
+        if self.visualizer is not None and self.visualizer.main_frame is not None:
+            self.visualizer.main_frame.destroy()
+        self.visualizer = None
+        self.prebuild_steps = None
 
     # Bar update
     def update_progress_bar(self, progress, fill_color=None, outline_color=None):
@@ -143,8 +176,19 @@ class LoadingScreen(tk.Frame):
 
     # App start
     def _start_main_app(self):
+        if self.visualizer is not None:
+            # Finish any slices the idle loop has not reached yet
+            try:
+                while self.prebuild_steps:
+                    self.prebuild_steps.popleft()()
+            except Exception as e:
+                print(f"Error preparing visualizer: {e}")
+                self._discard_prebuilt()
         self.destroy()
-        app = InsertionSortVisualizer(self.root)
+        if self.visualizer is None:
+            self.visualizer = InsertionSortVisualizer(self.root)
+        else:
+            self.visualizer.show()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
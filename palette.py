@@ -0,0 +1,147 @@
+"""
+Palette module for the Insertion Sort Visualizer.
+Holds both themes' colors and ttk settings, and precomputes the color
+gradients between bar states so fading a bar is a table lookup.
+"""
+
+GRADIENT_STEPS = 64
+BAR_STATES = ('default', 'current', 'compare', 'sorted', 'insert')
+
+
+# Hex to RGB
+def hex_to_rgb(hex_color):
+    hex_color = hex_color.lstrip('#')
+    return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+
+
+# RGB to hex
+def rgb_to_hex(rgb):
+    return '#{:02x}{:02x}{:02x}'.format(int(round(rgb[0])), int(round(rgb[1])), int(round(rgb[2])))
+
+
+# Gradient
+def gradient(color1, color2, steps=GRADIENT_STEPS):
+    """
+    steps colors from color1 to color2, both included.
+    """
+    rgb1 = hex_to_rgb(color1)
+    rgb2 = hex_to_rgb(color2)
+    last = max(1, steps - 1)
+    return [rgb_to_hex(tuple(a + (b - a) * k / last for a, b in zip(rgb1, rgb2)))
+            for k in range(steps)]
+
+
+class TransitionLUT:
+    """
+    Fixed-size lookup table of state-to-state color ramps for one palette.
+    Memory is len(BAR_STATES)**2 * steps strings, whatever is drawn.
+    """
+    def __init__(self, colors, steps=GRADIENT_STEPS):
+        self.steps = steps
+        self.ramps = {}
+        for from_state in BAR_STATES:
+            for to_state in BAR_STATES:
+                if from_state == to_state:
+                    ramp = [colors[from_state]] * steps
+                else:
+                    ramp = gradient(colors[from_state], colors[to_state], steps)
+                self.ramps[(from_state, to_state)] = ramp
+
+    # Lookup
+    def color(self, from_state, to_state, factor):
+        """
+        Color a factor (0.0 to 1.0) of the way from one state to another.
+        """
+        index = int(factor * (self.steps - 1) + 0.5)
+        return self.ramps[(from_state, to_state)][min(max(index, 0), self.steps - 1)]
+
+
+# Per-theme colors. Bar colors are shared; canvas and widget colors differ.
+BAR_COLORS = {
+    'default': "#4C566A",
+    'current': "#EBCB8B",
+    'compare': "#BF616A",
+    'sorted': "#A3BE8C",
+    'insert': "#81A1C1",
+    'text': "#ECEFF4",
+    'text_bg': "#2E3440",
+}
+
+THEMES = {
+    'dark': {
+        'colors': BAR_COLORS,
+        'canvas_bg': "#3B4252",
+        'grid': "#2E3440",
+        'status_fg': "#A3BE8C",
+        'bg': "#1E1E1E",
+        'fg': "#FFFFFF",
+        'button': "#2D2D2D",
+        'hover': "#3E3E3E",
+        'text': "#D4D4D4",
+        'border': "#3E3E3E",
+        'radio_bg': "#2D2D2D",
+        'radio_fg': "#FFFFFF",
+        'radio_selected': "#007ACC",
+        'radio_hover': "#3E3E3E",
+        'radio_container_bg': "#252526",
+    },
+    'light': {
+        'colors': BAR_COLORS,
+        'canvas_bg': "#ECEFF4",
+        'grid': "#E5E9F0",
+        'status_fg': "#2E3440",
+        'bg': "#AAAAAA",
+        'fg': "#333333",
+        'button': "#E1E1E1",
+        'hover': "#D0D0D0",
+        'text': "#333333",
+        'border': "#CCCCCC",
+        'radio_bg': "#FFFFFF",
+        'radio_fg': "#333333",
+        'radio_selected': "#0078D4",
+        'radio_hover': "#F0F0F0",
+        'radio_container_bg': "#F8F8F8",
+    },
+}
+
+
+# ttk settings
+def style_settings(theme):
+    """
+    ttk.Style.theme_create settings for one entry of THEMES.
+    """
+    return {
+        "TFrame": {"configure": {"background": theme['bg']}},
+        "TLabel": {"configure": {"background": theme['bg'], "foreground": theme['text'],
+                                 "font": ("Segoe UI", 10)}},
+        "TButton": {
+            "configure": {"background": theme['button'], "foreground": theme['text'],
+                          "font": ("Segoe UI", 10), "borderwidth": 0,
+                          "focusthickness": 0, "padding": 8},
+            "map": {"background": [('active', theme['hover'])],
+                    "foreground": [('active', theme['fg'])]},
+        },
+        "TEntry": {"configure": {"fieldbackground": theme['button'], "foreground": theme['text'],
+                                 "padding": 8, "font": ("Segoe UI", 10)}},
+        "Tooltip.TFrame": {"configure": {"background": "#2D2D2D"}},
+        "Tooltip.TLabel": {"configure": {"background": "#2D2D2D", "foreground": "#FFFFFF"}},
+        "CanvasBorder.TFrame": {"configure": {"background": theme['border']}},
+        "Speed.TFrame": {"configure": {"background": theme['radio_container_bg'],
+                                       "relief": "flat", "borderwidth": 1}},
+        "Speed.TRadiobutton": {
+            "configure": {"background": theme['radio_bg'], "foreground": theme['radio_fg'],
+                          "font": ("Segoe UI", 10, "bold"), "padding": (15, 8),
+                          "indicatorcolor": theme['radio_selected'],
+                          "indicatorbackground": theme['radio_bg'],
+                          "indicatorrelief": "flat", "borderwidth": 1,
+                          "relief": "flat", "focusthickness": 0},
+            "map": {"background": [('active', theme['radio_hover']),
+                                   ('selected', theme['radio_selected'])],
+                    "foreground": [('active', theme['radio_fg']), ('selected', "#FFFFFF")],
+                    "indicatorcolor": [('selected', "#FFFFFF")],
+                    "indicatorbackground": [('selected', theme['radio_selected'])],
+                    "relief": [('selected', 'flat')],
+                    "borderwidth": [('selected', 0)],
+                    "focusthickness": [('selected', 0)]},
+        },
+    }
@@ -0,0 +1,132 @@
+"""
+Playlist module for the Insertion Sort Visualizer.
+A lesson file lists the arrays of a class, one per line. While one array
+plays, the traces of the next few are built on a process pool and put in
+the trace cache, so moving on to the next array starts without waiting.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from headless import parse_array
+from sort_trace import build_trace
+from trace_cache import trace_key
+
+PREFETCH_AHEAD = 3
+MAX_LENGTH = 50
+
+
+# Read
+def read_lesson(path):
+    """
+    Arrays of a lesson file; blank lines and lines starting with # are
+    skipped.
+    """
+    arrays = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for number, line in enumerate(f, start=1):
+            if not line.strip() or line.startswith('#'):
+                continue
+            try:
+                data = parse_array(line)
+            except ValueError:
+                raise ValueError(f"Line {number}: invalid number") from None
+            if any(value < 0 for value in data):
+                raise ValueError(f"Line {number}: only positive integers are allowed")
+            if len(data) > MAX_LENGTH:
+                raise ValueError(f"Line {number}: maximum array length is {MAX_LENGTH} numbers")
+            if data:
+                arrays.append(data)
+    if not arrays:
+        raise ValueError("The lesson has no arrays")
+    return arrays
+
+
+# Prepare
+def prepare_traces(data):
+    """
+    Both traces start_sort may ask for: auto (verbose) and step-by-step.
+    Runs in a worker process.
+    """
+    return build_trace(data, 'insertion', True), build_trace(data, 'insertion', False)
+
+
+class LessonPlaylist:
+    """
+    The arrays of a lesson and a cursor into them. Entries within
+    lookahead of the cursor are prepared on a process pool; renders holds
+    whatever the caller prepared for an entry's first draw.
+    """
+    # Init
+    def __init__(self, arrays, trace_cache, lookahead=PREFETCH_AHEAD, max_workers=None):
+        self.arrays = [list(data) for data in arrays]
+        self.trace_cache = trace_cache
+        self.lookahead = lookahead
+        self.max_workers = max_workers or lookahead
+        self.position = 0
+        self.ready = set()
+        self.renders = {}
+        self._futures = {}
+        self._pool = None
+
+    def __len__(self):
+        return len(self.arrays)
+
+    # Move
+    def go(self, index):
+        """
+        Move the cursor to index and prefetch around it; returns a copy of
+        the array there.
+        """
+        self.position = index
+        window = self.window()
+        for stale in [i for i in self.renders if i not in window]:
+            del self.renders[stale]
+        self.prefetch()
+        return list(self.arrays[index])
+
+    def window(self):
+        """
+        Indices worth preparing: the previous entry, the current one and
+        lookahead entries after it.
+        """
+        return range(max(0, self.position - 1), min(len(self.arrays), self.position + self.lookahead + 1))
+
+    # Prefetch
+    def prefetch(self):
+        for index in self.window():
+            if index in self.ready or index in self._futures:
+                continue
+            data = self.arrays[index]
+            if all(self.trace_cache.get(trace_key(data, verbose=verbose)) is not None
+                   for verbose in (True, False)):
+                self.ready.add(index)
+                continue
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            self._futures[index] = self._pool.submit(prepare_traces, data)
+
+    # Poll
+    def poll(self):
+        """
+        Cache finished traces; returns the indices that became ready.
+        """
+        finished = []
+        for index, future in list(self._futures.items()):
+            if future.done():
+                del self._futures[index]
+                verbose_trace, step_trace = future.result()
+                data = self.arrays[index]
+                self.trace_cache.put(trace_key(data, verbose=True), verbose_trace)
+                self.trace_cache.put(trace_key(data, verbose=False), step_trace)
+                self.ready.add(index)
+                finished.append(index)
+        return finished
+
+    def pending(self):
+        return bool(self._futures)
+
+    # Stop
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        self._futures.clear()
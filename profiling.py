@@ -0,0 +1,172 @@
+"""
+Profiling module for the Insertion Sort Visualizer.
+Opt-in session profiling: cProfile and tracemalloc for the whole run plus
+named timing spans kept in a small ring buffer. Enabled by setting
+ISV_PROFILE to an output directory (or 1 for the current directory), or
+with --profile on the command line. Reports are written when the window
+closes.
+"""
+
+import cProfile
+import functools
+import io
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+PROFILE_ENV = "ISV_PROFILE"
+SPAN_CAPACITY = 4096
+TOP_ALLOCATIONS = 25
+
+# Methods of the visualizer wrapped in timing spans
+HOT_METHODS = ('insertion_sort', 'step_by_step_sort', 'queue_animation',
+               'animate_frame', 'draw_bars', 'flush_statistics')
+
+_active = None
+
+
+class SpanRecorder:
+    """
+    Ring buffer of (name, start_ms, duration_ms); old spans fall off.
+    """
+    def __init__(self, capacity=SPAN_CAPACITY):
+        self.spans = deque(maxlen=capacity)
+
+    # Span
+    @contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.spans.append((name, start * 1000, (end - start) * 1000))
+
+    # Wrap
+    def wrap(self, name, func):
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            with self.span(name):
+                return func(*args, **kwargs)
+        return timed
+
+    # Summary
+    def summary(self):
+        """
+        Per-name count, total, mean and max duration in ms, slowest first.
+        """
+        totals = {}
+        for name, _, duration in self.spans:
+            count, total, worst = totals.get(name, (0, 0.0, 0.0))
+            totals[name] = (count + 1, total + duration, max(worst, duration))
+        rows = [(name, count, total, total / count, worst)
+                for name, (count, total, worst) in totals.items()]
+        return sorted(rows, key=lambda row: row[2], reverse=True)
+
+
+class SessionProfiler:
+    """
+    cProfile plus tracemalloc for one visualizer session.
+    """
+    def __init__(self, out_dir="."):
+        self.out_dir = out_dir
+        self.spans = SpanRecorder()
+        self.profile = cProfile.Profile()
+        self._thread_profiles = []
+        self._lock = threading.Lock()
+        self.started = None
+
+    # Start
+    def start(self):
+        global _active
+        tracemalloc.start(10)
+        self.started = time.strftime("%Y%m%d-%H%M%S")
+        self.profile.enable()
+        _active = self
+        return self
+
+    # Threads
+    @contextmanager
+    def profile_thread(self):
+        """
+        cProfile only sees the thread it was enabled on, so background
+        threads get their own profile that is merged into the report.
+        """
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            with self._lock:
+                self._thread_profiles.append(profile)
+
+    # Instrument
+    def instrument(self, obj, names=HOT_METHODS):
+        """
+        Replace obj's methods with span-timed wrappers. Without profiling
+        nothing is wrapped, so the hot path stays untouched.
+        """
+        for name in names:
+            method = getattr(obj, name, None)
+            if method is not None:
+                setattr(obj, name, self.spans.wrap(name, method))
+
+    # Finish
+    def finish(self):
+        """
+        Stop profiling and write the reports; returns their paths.
+        """
+        global _active
+        if _active is self:
+            _active = None
+        self.profile.disable()
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        os.makedirs(self.out_dir, exist_ok=True)
+        base = os.path.join(self.out_dir, f"isv-profile-{self.started}")
+
+        stats = pstats.Stats(self.profile)
+        with self._lock:
+            for profile in self._thread_profiles:
+                stats.add(profile)
+        stats.dump_stats(base + ".pstats")
+
+        report = io.StringIO()
+        report.write(f"Top {TOP_ALLOCATIONS} allocations by line\n")
+        for stat in snapshot.statistics('lineno')[:TOP_ALLOCATIONS]:
+            report.write(f"{stat}\n")
+        report.write("\nTiming spans (last {} kept)\n".format(self.spans.spans.maxlen))
+        report.write(f"{'name':<20} {'count':>7} {'total ms':>10} {'mean ms':>9} {'max ms':>9}\n")
+        for name, count, total, mean, worst in self.spans.summary():
+            report.write(f"{name:<20} {count:>7} {total:>10.1f} {mean:>9.2f} {worst:>9.2f}\n")
+        report.write("\nTop functions by cumulative time\n")
+        pstats.Stats(self.profile, stream=report).sort_stats('cumulative').print_stats(25)
+        with open(base + ".txt", 'w', encoding='utf-8') as f:
+            f.write(report.getvalue())
+        return base + ".pstats", base + ".txt"
+
+
+# Active
+def active():
+    """
+    The running SessionProfiler, or None.
+    """
+    return _active
+
+
+# From env
+def session_from_env():
+    """
+    Start a SessionProfiler when ISV_PROFILE is set.
+    """
+    value = os.environ.get(PROFILE_ENV, "").strip()
+    if not value or value == "0":
+        return None
+    if _active is not None:
+        return _active
+    return SessionProfiler("." if value == "1" else value).start()
@@ -0,0 +1,87 @@
+"""
+Race module for the Insertion Sort Visualizer.
+Precomputes the traces of several algorithms on a process pool, then
+plays them back in lockstep on a shared comparison clock.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from lanes import LaneView, SortLane
+from sort_trace import OP_COMPARE, build_trace
+from trace_cache import trace_key
+
+RACE_ALGORITHMS = [
+    ("Insertion sort", 'insertion'),
+    ("Binary insertion sort", 'binary'),
+    ("Shell sort", 'shell'),
+]
+
+
+class TracePrecompute:
+    """
+    Builds the traces that are not cached yet on a process pool.
+    """
+    # Init
+    def __init__(self, data, trace_cache, algorithms=RACE_ALGORITHMS, max_workers=None):
+        self.data = list(data)
+        self.trace_cache = trace_cache
+        self.algorithms = algorithms
+        self.traces = {}
+        self._futures = {}
+        self._pool = None
+        for _, variant in algorithms:
+            trace = trace_cache.get(trace_key(self.data, variant, False))
+            if trace is not None:
+                self.traces[variant] = trace
+        missing = [variant for _, variant in algorithms if variant not in self.traces]
+        if missing:
+            self._pool = ProcessPoolExecutor(max_workers=max_workers or len(missing))
+            for variant in missing:
+                self._futures[variant] = self._pool.submit(build_trace, self.data, variant, False)
+
+    # Poll
+    def done(self):
+        """
+        Collect finished traces; True once every trace is ready.
+        """
+        for variant, future in list(self._futures.items()):
+            if future.done():
+                trace = future.result()
+                self.trace_cache.put(trace_key(self.data, variant, False), trace)
+                self.traces[variant] = trace
+                del self._futures[variant]
+        if not self._futures:
+            self.shutdown()
+            return True
+        return False
+
+    # Lanes
+    def lanes(self):
+        return [SortLane(name, self.data, self.traces[variant])
+                for name, variant in self.algorithms]
+
+    # Stop
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+class RaceView(LaneView):
+    """
+    Lanes that advance on a shared comparison clock: every frame each
+    algorithm plays its events up to the same number of comparisons.
+    """
+    # Init
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.clock = 0
+
+    # Advance
+    def advance_lanes(self):
+        self.clock += self.steps_per_frame
+        for lane in self.lanes:
+            while not lane.done:
+                next_op = lane.trace[lane.pos][0]
+                if next_op == OP_COMPARE and lane.comparisons >= self.clock:
+                    break
+                lane.advance(1)
@@ -0,0 +1,138 @@
+"""
+Records module for the Insertion Sort Visualizer.
+Sorts CSV records by one key column. Each key is parsed once and replaced
+by its dense rank in a compact array, so the sort compares small integers
+and never looks at the records again. Equal keys share a rank, and the
+insertion sorts only move an element past strictly greater ones, so
+records with equal keys keep their input order.
+"""
+
+import csv
+import math
+import time
+from array import array
+from sort_trace import OP_SELECT, OP_SHIFT, OP_INSERT, OP_MOVE
+
+# Shortest bar, as a fraction of the full height, for the smallest key
+MIN_BAR_FRACTION = 0.05
+LABEL_LENGTH = 8
+
+
+# Column
+def column_index(header, column):
+    """
+    Index of column, given by header name or 1-based number.
+    """
+    column = str(column).strip()
+    names = [name.strip() for name in header]
+    if column in names:
+        return names.index(column)
+    if column.isdigit() and 1 <= int(column) <= len(header):
+        return int(column) - 1
+    raise ValueError(f"No column {column!r}; columns are {', '.join(names)}")
+
+
+# Keys
+def parse_keys(texts):
+    """
+    Floats when every key is a finite number, otherwise the stripped text.
+    """
+    try:
+        numbers = [float(text) for text in texts]
+    except ValueError:
+        return texts, False
+    if all(math.isfinite(number) for number in numbers):
+        return numbers, True
+    return texts, False
+
+
+class RecordSet:
+    """
+    CSV records with their keys extracted once; index is the 0-based key
+    column.
+
+    ranks holds the dense rank of every record's key; keys lists the
+    distinct keys by rank, with a bar label and a bar height per rank.
+    """
+    def __init__(self, header, records, index):
+        start = time.perf_counter()
+        self.header = header
+        self.records = records
+        self.column = header[index].strip()
+        self.column_index = index
+        texts = [row[index].strip() if index < len(row) else '' for row in records]
+        keys, self.numeric = parse_keys(texts)
+        self.keys = sorted(set(keys))
+        rank_of = {key: rank for rank, key in enumerate(self.keys)}
+        self.ranks = array('l', [rank_of[key] for key in keys])
+        self.key_seconds = time.perf_counter() - start
+        self.labels = [self.label(key) for key in self.keys]
+        self.scale = self.heights()
+
+    def __len__(self):
+        return len(self.records)
+
+    # Label
+    def label(self, key):
+        text = f"{key:g}" if self.numeric else key
+        return text if len(text) <= LABEL_LENGTH else text[:LABEL_LENGTH - 1] + "…"
+
+    # Heights
+    def heights(self):
+        """
+        Bar height per rank as a fraction of the full height. Numeric keys
+        are scaled by value, so negative keys work; text keys by rank.
+        """
+        count = len(self.keys)
+        if not self.numeric:
+            return [(rank + 1) / count for rank in range(count)]
+        low, high = self.keys[0], self.keys[-1]
+        if high == low:
+            return [1.0] * count
+        return [MIN_BAR_FRACTION + (1 - MIN_BAR_FRACTION) * (key - low) / (high - low)
+                for key in self.keys]
+
+    # Order
+    def sorted_order(self, events):
+        """
+        Replay a trace of ranks on record positions; returns the record
+        indices in the order the sort left them.
+        """
+        order = list(range(len(self.records)))
+        held = None
+        for op, i, j, _ in events:
+            if op == OP_SELECT:
+                held = order[i]
+            elif op == OP_SHIFT:
+                order[j + 1] = order[j]
+            elif op == OP_MOVE:
+                order[j] = order[i]
+            elif op == OP_INSERT:
+                order[j] = held
+        return order
+
+    # Write
+    def write_sorted(self, path, events):
+        """
+        Write the header and the records in the order events leave them.
+        """
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(self.header)
+            writer.writerows(self.records[k] for k in self.sorted_order(events))
+
+
+# Load
+def load_records(path, column):
+    """
+    Read a CSV file whose first row is the header and extract column as
+    the sort key.
+    """
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        try:
+            rows = [row for row in csv.reader(f) if any(cell.strip() for cell in row)]
+        except csv.Error as e:
+            raise ValueError(f"Invalid CSV: {e}") from e
+    if len(rows) < 2:
+        raise ValueError("The file needs a header row and at least one record")
+    return RecordSet(rows[0], rows[1:], column_index(rows[0], column))
@@ -0,0 +1,71 @@
+"""
+Rounded panel module for the Insertion Sort Visualizer frame layout.
+Outlines are computed once per (size, radius, border) and existing
+polygons only get new coordinates when the size really changes.
+"""
+
+import tkinter as tk
+from functools import lru_cache
+
+
+# Outline
+@lru_cache(maxsize=128)
+def rounded_outline(width, height, radius, border_width=0):
+    """
+    Smoothed-polygon points for a rounded rectangle: (border, fill).
+    border is None without a border; fill is inset by border_width.
+    """
+    def points(inset):
+        return (radius + inset, inset,
+                width - radius - inset, inset,
+                width - inset, radius + inset,
+                width - inset, height - radius - inset,
+                width - radius - inset, height - inset,
+                radius + inset, height - inset,
+                inset, height - radius - inset,
+                inset, radius + inset)
+
+    if border_width > 0:
+        return points(0), points(border_width)
+    return None, points(0)
+
+
+class RoundedRectangleCanvas(tk.Canvas):
+    """
+    A Canvas that draws a rounded rectangle as its background.
+    """
+    # Init
+    def __init__(self, parent, corner_radius, fill_color, border_color=None, border_width=0, **kwargs):
+        super().__init__(parent, highlightthickness=0, bg=fill_color, **kwargs)
+        self.corner_radius = corner_radius
+        self.fill_color = fill_color
+        self.border_color = border_color
+        self.border_width = border_width
+        self._size = None
+        self._border_item = None
+        self._fill_item = None
+        self.bind("<Configure>", self._draw_rounded_rectangle)
+
+    # Draw shape
+    def _draw_rounded_rectangle(self, event=None):
+        width = event.width if event is not None else self.winfo_width()
+        height = event.height if event is not None else self.winfo_height()
+        # Configure also fires for moves and re-maps; only size matters here
+        if (width, height) == self._size or width <= 1 or height <= 1:
+            return
+        self._size = (width, height)
+        border_width = self.border_width if self.border_color else 0
+        border, fill = rounded_outline(width, height, self.corner_radius, border_width)
+        if border is not None:
+            if self._border_item is None:
+                self._border_item = self.create_polygon(border, smooth=True,
+                                                         fill=self.border_color, tags="border")
+            else:
+                self.coords(self._border_item, border)
+        if self._fill_item is None:
+            self._fill_item = self.create_polygon(fill, smooth=True, fill=self.fill_color, tags="rect")
+        else:
+            self.coords(self._fill_item, fill)
+        self.tag_lower("rect")
+        if self._border_item is not None:
+            self.tag_lower("border")
@@ -0,0 +1,128 @@
+"""
+Scheduler module for the Insertion Sort Visualizer.
+Runs all timed work of a window from one Tk after() tick.
+"""
+
+import heapq
+import itertools
+import math
+import time
+
+
+class TickScheduler:
+    """
+    Single master tick for sort steps, animation frames and polling.
+
+    Tasks run in (due time, submission order), so callbacks that are due
+    together always run in the order they were scheduled. A tick stops
+    after frame_budget_ms and leaves the rest for the next tick. With no
+    pending tasks no after() is armed, so the scheduler is fully idle.
+    """
+    # Init
+    def __init__(self, root, frame_budget_ms=16):
+        self.root = root
+        self.frame_budget_ms = frame_budget_ms
+        self._tasks = []
+        self._live = set()
+        self._ids = itertools.count(1)
+        self._job = None
+        self._job_due = None
+        self._last_id = 0
+        self._in_tick = False
+        self.ticks = 0
+
+    # Clock
+    def now(self):
+        return time.perf_counter() * 1000
+
+    # Schedule
+    def call_later(self, delay_ms, callback):
+        """
+        Run callback after delay_ms; returns a task id for cancel().
+        """
+        task_id = next(self._ids)
+        self._last_id = task_id
+        heapq.heappush(self._tasks, (self.now() + max(0, delay_ms), task_id, callback))
+        self._live.add(task_id)
+        self._arm()
+        return task_id
+
+    # Cancel
+    def cancel(self, task_id):
+        """
+        Drop a pending task. Re-arms when it was the next one due, and
+        compacts the queue once dead entries outnumber live ones.
+        """
+        if task_id is None or task_id not in self._live:
+            return
+        self._live.discard(task_id)
+        if len(self._tasks) > 2 * len(self._live):
+            self._tasks = [task for task in self._tasks if task[1] in self._live]
+            heapq.heapify(self._tasks)
+        # A tick re-arms when it ends
+        if not self._in_tick:
+            self._arm()
+
+    # Clear
+    def clear(self):
+        """
+        Drop every pending task.
+        """
+        self._tasks.clear()
+        self._live.clear()
+        self._arm()
+
+    # Idle check
+    def is_idle(self):
+        return not self._live
+
+    # Arm
+    def _arm(self):
+        while self._tasks and self._tasks[0][1] not in self._live:
+            heapq.heappop(self._tasks)
+        if not self._tasks:
+            if self._job is not None:
+                self.root.after_cancel(self._job)
+                self._job = None
+                self._job_due = None
+            return
+        due = self._tasks[0][0]
+        if self._job is not None:
+            if self._job_due == due:
+                return
+            self.root.after_cancel(self._job)
+        # Round up so a task that is not yet due never wakes the loop early
+        delay = max(0, math.ceil(due - self.now()))
+        self._job = self.root.after(delay, self._tick)
+        self._job_due = due
+
+    # Tick
+    def _tick(self):
+        self._job = None
+        self._job_due = None
+        self.ticks += 1
+        start = self.now()
+        last_id = self._last_id
+        self._in_tick = True
+        try:
+            self._run_due(start, last_id)
+        finally:
+            self._in_tick = False
+        self._arm()
+
+    # Run due
+    def _run_due(self, start, last_id):
+        while self._tasks:
+            due, task_id, callback = self._tasks[0]
+            if task_id not in self._live:
+                heapq.heappop(self._tasks)
+                continue
+            # Tasks queued during this tick wait for the next one
+            if due > start or task_id > last_id or self.now() - start >= self.frame_budget_ms:
+                break
+            heapq.heappop(self._tasks)
+            self._live.discard(task_id)
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error in scheduled task: {str(e)}")
@@ -0,0 +1,154 @@
+"""
+Session module for the Insertion Sort Visualizer.
+Saves the visualizer state to a compact binary snapshot and restores it
+without replaying the sort. The trace is stored inside the snapshot and
+memory-mapped on restore, so playback resumes at the saved position.
+
+Layout (little-endian):
+    header   magic, version, flags, speed, speed name, trace position,
+             counters, step state, array length, trace offset
+    arrays   initial data, then current data, one int64 per element
+    records  only with FLAG_RECORDS: key column index (uint32), CSV text
+             length (uint64), then the records as UTF-8 CSV with header
+    trace    an embedded trace file, see trace_file
+"""
+
+import csv
+import io
+import os
+import struct
+from array import array
+from records import RecordSet
+from trace_file import write_trace, MappedTrace
+
+MAGIC = b'ISVS'
+VERSION = 1
+
+FLAG_DARK = 1
+FLAG_SORTING = 2
+FLAG_STEP_BY_STEP = 4
+FLAG_HAS_CURRENT = 8
+FLAG_VERBOSE = 16
+FLAG_RECORDS = 32
+
+NO_STEP_MODE = 255
+
+HEADER = struct.Struct('<4sHBxI16sQQQIIIiqBxxxIIQQIQ')
+RECORDS_HEADER = struct.Struct('<IQ')
+
+
+class SessionState:
+    """
+    The fields of a snapshot; the trace is kept separately.
+    """
+    __slots__ = ('initial_data', 'data', 'dark_theme', 'sorting', 'step_by_step',
+                 'verbose', 'speed', 'speed_name', 'trace_pos', 'comparisons', 'swaps',
+                 'current_iteration', 'total_iterations', 'step_i', 'step_j',
+                 'step_current', 'step_op', 'current_step_number', 'current_substep',
+                 'work_done', 'total_work', 'records')
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+
+# Save
+def save_session(path, state, trace):
+    """
+    Write state and the events of trace to path.
+    """
+    initial = array('q', state.initial_data)
+    data = array('q', state.data)
+    records = b''
+    if state.records is not None:
+        # The records themselves; keys and ranks are extracted again on load
+        text = io.StringIO()
+        writer = csv.writer(text)
+        writer.writerow(state.records.header)
+        writer.writerows(state.records.records)
+        blob = text.getvalue().encode('utf-8')
+        records = RECORDS_HEADER.pack(state.records.column_index, len(blob)) + blob
+    flags = ((FLAG_DARK if state.dark_theme else 0)
+             | (FLAG_RECORDS if state.records is not None else 0)
+             | (FLAG_SORTING if state.sorting else 0)
+             | (FLAG_STEP_BY_STEP if state.step_by_step else 0)
+             | (FLAG_HAS_CURRENT if state.step_current is not None else 0)
+             | (FLAG_VERBOSE if state.verbose else 0))
+    trace_offset = HEADER.size + 8 * 2 * len(initial) + len(records)
+    # Write beside the target and swap it in, so a trace mapped from the
+    # old file stays valid and a failed save leaves the old file intact
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(
+            MAGIC, VERSION, flags, state.speed, state.speed_name.encode('ascii')[:16],
+            state.trace_pos, state.comparisons, state.swaps,
+            state.current_iteration, state.total_iterations,
+            state.step_i, -1 if state.step_j is None else state.step_j,
+            state.step_current if state.step_current is not None else 0,
+            NO_STEP_MODE if state.step_op is None else state.step_op,
+            state.current_step_number, state.current_substep,
+            state.work_done, state.total_work, len(initial), trace_offset))
+        f.write(initial.tobytes())
+        f.write(data.tobytes())
+        f.write(records)
+        write_trace(f, state.initial_data, trace, verbose=state.verbose)
+    os.replace(tmp_path, path)
+
+
+# Load
+def load_session(path):
+    """
+    Read a snapshot; returns (SessionState, MappedTrace). The trace is
+    mapped in place, so the caller must close it.
+    """
+    with open(path, 'rb') as f:
+        head = f.read(HEADER.size)
+        if len(head) < HEADER.size:
+            raise ValueError("Not a session file")
+        (magic, version, flags, speed, speed_name, trace_pos, comparisons, swaps,
+         current_iteration, total_iterations, step_i, step_j, step_current, step_op,
+         current_step_number, current_substep, work_done, total_work,
+         length, trace_offset) = HEADER.unpack(head)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a session file")
+        arrays = f.read(8 * 2 * length)
+        if len(arrays) < 8 * 2 * length:
+            raise ValueError("Session file is truncated")
+        records = None
+        if flags & FLAG_RECORDS:
+            head = f.read(RECORDS_HEADER.size)
+            if len(head) < RECORDS_HEADER.size:
+                raise ValueError("Session file is truncated")
+            column, size = RECORDS_HEADER.unpack(head)
+            blob = f.read(size)
+            if len(blob) < size:
+                raise ValueError("Session file is truncated")
+            try:
+                rows = list(csv.reader(io.StringIO(blob.decode('utf-8'))))
+            except csv.Error as e:
+                raise ValueError(f"Session records are invalid: {e}") from e
+            if len(rows) < 2:
+                raise ValueError("Session records are missing")
+            if column >= len(rows[0]):
+                raise ValueError("Session records have no key column")
+            records = RecordSet(rows[0], rows[1:], column)
+    values = array('q', arrays).tolist()
+    if records is not None and records.ranks.tolist() != values[:length]:
+        raise ValueError("Session records do not match the saved array")
+    state = SessionState(
+        initial_data=values[:length], data=values[length:],
+        dark_theme=bool(flags & FLAG_DARK), sorting=bool(flags & FLAG_SORTING),
+        step_by_step=bool(flags & FLAG_STEP_BY_STEP), verbose=bool(flags & FLAG_VERBOSE),
+        speed=speed, speed_name=speed_name.rstrip(b'\0').decode('ascii'),
+        trace_pos=trace_pos, comparisons=comparisons, swaps=swaps,
+        current_iteration=current_iteration, total_iterations=total_iterations,
+        step_i=step_i, step_j=None if step_j < 0 else step_j,
+        step_current=step_current if flags & FLAG_HAS_CURRENT else None,
+        step_op=None if step_op == NO_STEP_MODE else step_op,
+        current_step_number=current_step_number, current_substep=current_substep,
+        work_done=work_done, total_work=total_work, records=records)
+    trace = MappedTrace(path, offset=trace_offset)
+    if trace_pos > len(trace):
+        trace.close()
+        raise ValueError("Session file is truncated")
+    return state, trace
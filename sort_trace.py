@@ -0,0 +1,293 @@
+"""
+Sort trace module for the Insertion Sort Visualizer.
+Records every step of a sort as a compact event so it can be replayed.
+"""
+
+# Event opcodes. Each event is a tuple (op, i, j, value).
+OP_SELECT = 0        # i: element picked up, value: the element
+OP_COMPARE = 1       # j: position compared, value: data[j]
+OP_SHIFT_CHECK = 2   # j: position that must move, value: data[j]
+OP_SHIFT = 3         # data[j + 1] = value
+OP_FOUND = 4         # j: position that stops the scan, value: data[j]
+OP_INSERT_POINT = 5  # j: insertion position, value: the element
+OP_INSERT = 6        # data[j] = value
+OP_COMPLETE = 7      # j: final position, value: the element
+OP_DONE = 8          # i: array length
+OP_MOVE = 9          # data[j] = value, moved from position i
+
+# Events that write into the array
+MOVE_OPS = (OP_SHIFT, OP_INSERT, OP_MOVE)
+
+OP_NAMES = {
+    OP_SELECT: 'select',
+    OP_COMPARE: 'compare',
+    OP_SHIFT_CHECK: 'shift',
+    OP_SHIFT: 'shift_move',
+    OP_FOUND: 'found',
+    OP_INSERT_POINT: 'insert_point',
+    OP_INSERT: 'insert',
+    OP_COMPLETE: 'complete',
+    OP_DONE: 'done',
+    OP_MOVE: 'move',
+}
+
+
+# Insertion trace
+def iter_insertion_sort_trace(data, verbose=True):
+    """
+    Yield the events of insertion sort one at a time.
+
+    With verbose=False the "found insertion point" comparison result is
+    left out, which matches what step-by-step mode shows.
+    """
+    data = list(data)
+    for i in range(1, len(data)):
+        current = data[i]
+        yield (OP_SELECT, i, i, current)
+        j = i - 1
+        while j >= 0:
+            yield (OP_COMPARE, i, j, data[j])
+            if data[j] > current:
+                yield (OP_SHIFT_CHECK, i, j, data[j])
+                yield (OP_SHIFT, i, j, data[j])
+                data[j + 1] = data[j]
+                j -= 1
+            else:
+                if verbose:
+                    yield (OP_FOUND, i, j, data[j])
+                break
+        yield (OP_INSERT_POINT, i, j + 1, current)
+        yield (OP_INSERT, i, j + 1, current)
+        data[j + 1] = current
+        yield (OP_COMPLETE, i, j + 1, current)
+    yield (OP_DONE, len(data), 0, 0)
+
+
+# Insertion list
+def insertion_sort_trace(data, verbose=True):
+    """
+    Build the event list for insertion sort.
+    """
+    return list(iter_insertion_sort_trace(data, verbose))
+
+
+# Binary insertion trace
+def iter_binary_insertion_sort_trace(data, verbose=True):
+    """
+    Yield the events of insertion sort with a binary search for the
+    insertion point.
+    """
+    data = list(data)
+    for i in range(1, len(data)):
+        current = data[i]
+        yield (OP_SELECT, i, i, current)
+        low, high = 0, i
+        while low < high:
+            mid = (low + high) // 2
+            yield (OP_COMPARE, i, mid, data[mid])
+            if data[mid] > current:
+                high = mid
+            else:
+                low = mid + 1
+        if verbose:
+            yield (OP_INSERT_POINT, i, low, current)
+        for j in range(i - 1, low - 1, -1):
+            yield (OP_SHIFT, i, j, data[j])
+            data[j + 1] = data[j]
+        yield (OP_INSERT, i, low, current)
+        data[low] = current
+        yield (OP_COMPLETE, i, low, current)
+    yield (OP_DONE, len(data), 0, 0)
+
+
+# Shell trace
+def iter_shell_sort_trace(data, verbose=True):
+    """
+    Yield the events of Shell sort with the halving gap sequence.
+    """
+    data = list(data)
+    gap = len(data) // 2
+    while gap > 0:
+        for i in range(gap, len(data)):
+            current = data[i]
+            yield (OP_SELECT, i, i, current)
+            j = i
+            while j >= gap:
+                yield (OP_COMPARE, i, j - gap, data[j - gap])
+                if data[j - gap] <= current:
+                    break
+                yield (OP_MOVE, j - gap, j, data[j - gap])
+                data[j] = data[j - gap]
+                j -= gap
+            if verbose:
+                yield (OP_INSERT_POINT, i, j, current)
+            yield (OP_INSERT, i, j, current)
+            data[j] = current
+        gap //= 2
+    yield (OP_DONE, len(data), 0, 0)
+
+
+TRACE_BUILDERS = {
+    'insertion': iter_insertion_sort_trace,
+    'binary': iter_binary_insertion_sort_trace,
+    'shell': iter_shell_sort_trace,
+}
+
+
+# Iterate
+def iter_trace(data, variant='insertion', verbose=True):
+    """
+    Yield the trace of the named algorithm.
+    """
+    return TRACE_BUILDERS[variant](data, verbose)
+
+
+# Build
+def build_trace(data, variant='insertion', verbose=True):
+    """
+    Build a trace with the named algorithm.
+    """
+    return list(iter_trace(data, variant, verbose))
+
+
+# Inversions
+def count_inversions(data):
+    """
+    Number of pairs i < j with data[i] > data[j], by bottom-up merge sort
+    in O(n log n). This is exactly the number of shifts insertion sort does.
+    """
+    items = list(data)
+    n = len(items)
+    buffer = [None] * n
+    inversions = 0
+    width = 1
+    while width < n:
+        for low in range(0, n, 2 * width):
+            mid = min(low + width, n)
+            high = min(low + 2 * width, n)
+            i, j, k = low, mid, low
+            while i < mid and j < high:
+                if items[j] < items[i]:
+                    # items[j] jumps over every element left in the left run
+                    inversions += mid - i
+                    buffer[k] = items[j]
+                    j += 1
+                else:
+                    buffer[k] = items[i]
+                    i += 1
+                k += 1
+            buffer[k:k + mid - i] = items[i:mid]
+            k += mid - i
+            buffer[k:k + high - j] = items[j:high]
+        items, buffer = buffer, items
+        width *= 2
+    return inversions
+
+
+# Apply
+def apply_event(data, event):
+    """
+    Apply an event to data in place.
+    """
+    op, i, j, value = event
+    if op == OP_SHIFT:
+        data[j + 1] = value
+    elif op == OP_INSERT or op == OP_MOVE:
+        data[j] = value
+
+
+# Describe
+def describe_event(event, current, label=str):
+    """
+    Text shown for an event; current is the element being inserted.
+    label formats element values, e.g. record keys for their ranks.
+    """
+    op, i, j, value = event
+    value = label(value)
+    current = current if current is None else label(current)
+    if op == OP_SELECT:
+        return f"Step {i}: Selecting element {value} at position {i}"
+    if op == OP_COMPARE:
+        return f"Step {i}.{j}: Comparing {current} with {value} at position {j}"
+    if op == OP_SHIFT_CHECK:
+        return f"Step {i}.{j}: {value} > {current}, need to shift {value} right"
+    if op == OP_SHIFT:
+        return f"Step {i}.{j}: Shifting {value} from position {j} to {j+1}"
+    if op == OP_FOUND:
+        return f"Step {i}.{j}: {value} <= {current}, found insertion point"
+    if op == OP_INSERT_POINT:
+        return f"Step {i}.{j}: Found insertion point at position {j} for element {value}"
+    if op == OP_INSERT:
+        return f"Step {i}.{j}: Inserting {value} at position {j}"
+    if op == OP_COMPLETE:
+        return f"Step {i}: Completed insertion of {value} at position {j}"
+    if op == OP_MOVE:
+        return f"Moving {value} from position {i} to {j}"
+    return "Sorting Complete"
+
+
+class TraceStep:
+    """
+    One queued animation, described by its trace event only.
+    Colors, text and the move delta are derived from the event when shown.
+    """
+    __slots__ = ('event', 'current')
+
+    def __init__(self, event, current):
+        self.event = event
+        self.current = current
+
+    @property
+    def is_move(self):
+        return self.event[0] in MOVE_OPS
+
+    # Move
+    def move(self):
+        """
+        (from_index, to_index, value) for move steps, else None.
+        """
+        op, i, j, value = self.event
+        if op == OP_SHIFT:
+            return (j, j + 1, value)
+        if op == OP_INSERT or op == OP_MOVE:
+            return (i, j, value)
+        return None
+
+    # Text
+    def description(self, label=str):
+        return describe_event(self.event, self.current, label)
+
+    # Colors
+    def positions(self):
+        """
+        Color positions for get_bar_color.
+        """
+        op, i, j, value = self.event
+        if op == OP_SELECT:
+            return {"current": [i], "sorted": list(range(i))}
+        if op == OP_INSERT_POINT or op == OP_INSERT:
+            return {"current": [i], "insert": [j], "sorted": list(range(i))}
+        if op == OP_COMPLETE:
+            return {"sorted": list(range(i + 1))}
+        if op == OP_DONE:
+            return {"sorted": list(range(i))}
+        if op == OP_MOVE:
+            return {"compare": [i], "insert": [j]}
+        return {"current": [i], "compare": [j], "sorted": list(range(i))}
+
+
+class HistoryEntry:
+    """
+    Step-by-step history record.
+    """
+    __slots__ = ('step', 'step_number', 'substep', 'comparisons', 'swaps')
+
+    def __init__(self, step, step_number, substep, comparisons, swaps):
+        self.step = step
+        self.step_number = step_number
+        self.substep = substep
+        self.comparisons = comparisons
+        self.swaps = swaps
+
+    def description(self, label=str):
+        return self.step.description(label)
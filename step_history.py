@@ -0,0 +1,147 @@
+"""
+Step history module for the Insertion Sort Visualizer.
+Keeps the step-by-step history in fixed-size segments. Full segments are
+compressed, and once they exceed a memory cap the oldest ones are spilled
+to a temporary file, so memory stays flat however long a session runs.
+"""
+
+import pickle
+import tempfile
+import zlib
+from sort_trace import TraceStep, HistoryEntry, apply_event
+
+
+class StepHistory:
+    """
+    Append-only step history with random access and pop.
+
+    Every segment starts with a checkpoint of the array, so the array at
+    any step is the checkpoint plus at most segment_size replayed events.
+    """
+    def __init__(self, initial_data=(), max_bytes=256 * 1024, segment_size=256):
+        self.max_bytes = max_bytes
+        self.segment_size = segment_size
+        self._spill = None
+        self.reset(initial_data)
+
+    # Reset
+    def reset(self, initial_data=()):
+        """
+        Drop everything and start over from initial_data.
+        """
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+        self._sealed = []  # [blob or None, file offset, length] per full segment
+        self._memory = 0  # bytes of blobs still in memory
+        self._checkpoint = list(initial_data)
+        self._state = list(initial_data)
+        self._open = []
+        self._decoded = None  # (segment index, checkpoint, records)
+
+    clear = reset
+
+    def __len__(self):
+        return len(self._sealed) * self.segment_size + len(self._open)
+
+    # Append
+    def append(self, entry):
+        self._open.append((entry.step.event, entry.step.current, entry.step_number,
+                           entry.substep, entry.comparisons, entry.swaps))
+        apply_event(self._state, entry.step.event)
+        if len(self._open) >= self.segment_size:
+            self._seal()
+
+    # Pop
+    def pop(self):
+        """
+        Remove and return the newest entry.
+        """
+        if not self._open:
+            if not self._sealed:
+                raise IndexError("pop from empty history")
+            # Reopen the newest sealed segment
+            self._checkpoint, records = self._load(len(self._sealed) - 1)
+            blob, offset, length = self._sealed.pop()
+            if blob is not None:
+                self._memory -= len(blob)
+            elif self._spill is not None:
+                self._spill.truncate(offset)
+            self._decoded = None
+            self._open = list(records)
+        record = self._open.pop()
+        self._state = self._replay(self._checkpoint, self._open, len(self._open))
+        return self._entry(record)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("history index out of range")
+        segment, offset = divmod(index, self.segment_size)
+        if segment == len(self._sealed):
+            return self._entry(self._open[offset])
+        return self._entry(self._load(segment)[1][offset])
+
+    # State
+    def state_at(self, index):
+        """
+        The array after the step at index was applied.
+        """
+        if index < 0:
+            index += len(self)
+        segment, offset = divmod(index, self.segment_size)
+        if segment == len(self._sealed):
+            return self._replay(self._checkpoint, self._open, offset + 1)
+        checkpoint, records = self._load(segment)
+        return self._replay(checkpoint, records, offset + 1)
+
+    # Memory
+    def memory_bytes(self):
+        """
+        Compressed bytes held in memory (the open segment is not counted).
+        """
+        return self._memory
+
+    def _replay(self, checkpoint, records, count):
+        data = list(checkpoint)
+        for record in records[:count]:
+            apply_event(data, record[0])
+        return data
+
+    def _entry(self, record):
+        event, current, step_number, substep, comparisons, swaps = record
+        return HistoryEntry(TraceStep(event, current), step_number, substep, comparisons, swaps)
+
+    # Seal
+    def _seal(self):
+        blob = zlib.compress(pickle.dumps((self._checkpoint, self._open), pickle.HIGHEST_PROTOCOL))
+        self._sealed.append([blob, 0, len(blob)])
+        self._memory += len(blob)
+        self._checkpoint = list(self._state)
+        self._open = []
+        # Spill the oldest in-memory segments until under the cap
+        for record in self._sealed:
+            if self._memory <= self.max_bytes:
+                break
+            if record[0] is None:
+                continue
+            if self._spill is None:
+                self._spill = tempfile.TemporaryFile(prefix="isv-history-")
+            self._spill.seek(0, 2)
+            record[1] = self._spill.tell()
+            self._spill.write(record[0])
+            self._memory -= len(record[0])
+            record[0] = None
+
+    # Load
+    def _load(self, segment):
+        if self._decoded is not None and self._decoded[0] == segment:
+            return self._decoded[1], self._decoded[2]
+        blob, offset, length = self._sealed[segment]
+        if blob is None:
+            self._spill.seek(offset)
+            blob = self._spill.read(length)
+        checkpoint, records = pickle.loads(zlib.decompress(blob))
+        self._decoded = (segment, checkpoint, records)
+        return checkpoint, records
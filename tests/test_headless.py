@@ -0,0 +1,91 @@
+import io
+import json
+
+import pytest
+
+import batch
+import headless
+from sort_trace import build_trace, count_inversions
+from trace_file import MappedTrace
+
+
+def run(argv):
+    args = headless.build_parser().parse_args(argv)
+    out = io.StringIO()
+    return headless.run(args, out), out.getvalue()
+
+
+def test_parse_array():
+    assert headless.parse_array('5, 3 9,1') == [5, 3, 9, 1]
+    with pytest.raises(ValueError):
+        headless.parse_array('5,x')
+
+
+def test_analyze_counts():
+    data = [5, 2, 9, 1, 7, 3]
+    stats = headless.analyze(data)
+    assert stats['length'] == 6
+    assert stats['iterations'] == 5
+    assert stats['shifts'] == count_inversions(data)
+    assert stats['swaps'] == stats['shifts'] + 5
+
+
+def test_json_output_and_trace(tmp_path):
+    trace_path = str(tmp_path / 'run{index}.isvt')
+    code, out = run(['--json', '--trace-out', trace_path, '3,1,2', '4 3 2 1'])
+    assert code == 0
+    results = json.loads(out)
+    assert [r['shifts'] for r in results] == [2, 6]
+    with MappedTrace(trace_path.format(index=2)) as trace:
+        assert list(trace) == build_trace([4, 3, 2, 1])
+
+
+def test_several_arrays_need_an_index_in_the_trace_path(tmp_path):
+    code, _ = run(['--trace-out', str(tmp_path / 'run.isvt'), '3,1,2', '2,1'])
+    assert code == 2
+
+
+def test_csv_records(tmp_path):
+    source = tmp_path / 'people.csv'
+    source.write_text('name,age\nann,30\nbob,25\ncid,30\ndee,20\n', encoding='utf-8')
+    output = tmp_path / 'sorted.csv'
+    code, out = run(['--csv', str(source), '--key', 'age', '--output', str(output), '--json'])
+    assert code == 0
+    stats = json.loads(out)
+    assert stats['records'] == 4 and stats['key_column'] == 'age'
+    assert output.read_text(encoding='utf-8').split() == [
+        'name,age', 'dee,20', 'bob,25', 'ann,30', 'cid,30']
+
+
+def test_generate_arrays():
+    arrays = list(batch.generate_arrays('reversed:3:5:1'))
+    assert len(arrays) == 3
+    assert all(a == sorted(a, reverse=True) and len(a) == 5 for a in arrays)
+    assert list(batch.generate_arrays('random:2:4:9')) == list(batch.generate_arrays('random:2:4:9'))
+    with pytest.raises(ValueError):
+        list(batch.generate_arrays('spiral:1:1'))
+
+
+def test_batch_run_streams_in_order(tmp_path):
+    output = tmp_path / 'results.jsonl'
+    code, out = run(['--batch', '--generate', 'random:40:12:3', '--generate', 'sorted:5:12:3',
+                     '--chunk-size', '7', '--workers', '2', '--output', str(output), '--json'])
+    assert code == 0
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    expected = list(batch.generate_arrays('random:40:12:3')) + list(batch.generate_arrays('sorted:5:12:3'))
+    assert [line['shifts'] for line in lines] == [count_inversions(a) for a in expected]
+    summary = json.loads(out)
+    assert summary['arrays'] == 45
+    assert sum(c for _, _, c in summary['shifts']) == 45
+    assert summary['disorder'][0][2] >= 5
+
+
+def test_batch_summary_memory_is_bounded():
+    summary = batch.BatchSummary(sample_size=50)
+    for k in range(1000):
+        summary.add({'comparisons': k, 'shifts': k % 100, 'disorder': 0.25})
+    assert len(summary.comparisons.values) == 50
+    buckets = summary.histogram(summary.comparisons)
+    assert buckets[0][0] == 0 and buckets[-1][1] >= 999
+    assert sum(c for _, _, c in buckets) == pytest.approx(1000, abs=len(buckets))
+    assert summary.to_dict()['disorder'][2][2] == 1000
@@ -0,0 +1,71 @@
+import csv
+
+import pytest
+
+from records import RecordSet, column_index, load_records
+from sort_trace import build_trace
+
+HEADER = ['name', 'score', 'city']
+ROWS = [
+    ['ann', '3.5', 'oslo'],
+    ['bob', '-1', 'rome'],
+    ['cid', '3.5', 'lima'],
+    ['dee', '10', 'oslo'],
+    ['eve', '-1', 'kiev'],
+]
+
+
+def write_csv(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerows(rows)
+    return str(path)
+
+
+def test_column_index_by_name_or_number():
+    assert column_index(HEADER, 'city') == 2
+    assert column_index(HEADER, ' score ') == 1
+    assert column_index(HEADER, '1') == 0
+    assert column_index(['2', 'x'], '2') == 0  # header names win over numbers
+    with pytest.raises(ValueError):
+        column_index(HEADER, '4')
+    with pytest.raises(ValueError):
+        column_index(HEADER, 'age')
+
+
+def test_numeric_keys_are_ranked():
+    records = RecordSet(HEADER, ROWS, 1)
+    assert records.numeric
+    assert records.keys == [-1.0, 3.5, 10.0]
+    assert list(records.ranks) == [1, 0, 1, 2, 0]
+    assert records.labels == ['-1', '3.5', '10']
+    assert records.scale[0] < records.scale[1] < records.scale[2] == 1.0
+
+
+def test_text_keys_are_ranked():
+    records = RecordSet(HEADER, ROWS, 2)
+    assert not records.numeric
+    assert records.keys == ['kiev', 'lima', 'oslo', 'rome']
+    assert list(records.ranks) == [2, 3, 1, 2, 0]
+
+
+@pytest.mark.parametrize('variant', ['insertion', 'binary'])
+def test_sort_is_stable(tmp_path, variant):
+    records = RecordSet(HEADER, ROWS, 1)
+    trace = build_trace(list(records.ranks), variant)
+    order = records.sorted_order(trace)
+    assert [ROWS[k][0] for k in order] == ['bob', 'eve', 'ann', 'cid', 'dee']
+    out = tmp_path / 'sorted.csv'
+    records.write_sorted(str(out), trace)
+    with open(out, newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == HEADER
+    assert [row[0] for row in rows[1:]] == ['bob', 'eve', 'ann', 'cid', 'dee']
+
+
+def test_load_records(tmp_path):
+    path = write_csv(tmp_path / 'people.csv', [HEADER] + ROWS + [[]])
+    records = load_records(path, 'score')
+    assert records.column == 'score'
+    assert len(records) == len(ROWS)
+    with pytest.raises(ValueError):
+        load_records(write_csv(tmp_path / 'header.csv', [HEADER]), 'score')
@@ -0,0 +1,78 @@
+import pytest
+
+from records import RecordSet
+from session import SessionState, load_session, save_session
+from sort_trace import build_trace
+
+
+def state_for(initial, **fields):
+    values = dict(
+        initial_data=list(initial), data=list(initial), dark_theme=True, sorting=False,
+        step_by_step=False, verbose=True, speed=500, speed_name='normal', trace_pos=0,
+        comparisons=0, swaps=0, current_iteration=0, total_iterations=0, step_i=0,
+        step_j=None, step_current=None, step_op=None, current_step_number=0,
+        current_substep=0, work_done=0, total_work=0, records=None)
+    values.update(fields)
+    return SessionState(**values)
+
+
+def test_round_trip_mid_sort(tmp_path):
+    data = [5, 2, 9, 1, 7, 3]
+    trace = build_trace(data, verbose=False)
+    state = state_for(data, data=[2, 5, 9, 1, 7, 3], sorting=True, step_by_step=True,
+                      verbose=False, speed=2000, speed_name='slow', trace_pos=9,
+                      comparisons=3, swaps=2, current_iteration=2, total_iterations=5,
+                      step_i=2, step_j=1, step_current=9, step_op=1,
+                      current_step_number=2, current_substep=4, work_done=6, total_work=22)
+    path = str(tmp_path / 'lesson.isvs')
+    save_session(path, state, trace)
+    loaded, mapped = load_session(path)
+    try:
+        for name in SessionState.__slots__:
+            assert getattr(loaded, name) == getattr(state, name), name
+        assert list(mapped) == trace
+        assert mapped.verbose is False
+    finally:
+        mapped.close()
+
+
+def test_unset_optional_fields_stay_unset(tmp_path):
+    data = [3, 1, 2]
+    path = str(tmp_path / 's.isvs')
+    save_session(path, state_for(data, dark_theme=False), build_trace(data))
+    loaded, mapped = load_session(path)
+    mapped.close()
+    assert loaded.step_j is None and loaded.step_current is None and loaded.step_op is None
+    assert loaded.dark_theme is False and loaded.records is None
+
+
+def test_records_are_kept(tmp_path):
+    # A header named like a column number must not shift the key column
+    header = ['2', 'name', 'score']
+    rows = [['a', 'x', '3'], ['b', 'y', '1'], ['c', 'z', '2'], ['d', 'w', '1']]
+    records = RecordSet(header, rows, 2)
+    data = list(records.ranks)
+    path = str(tmp_path / 'records.isvs')
+    save_session(path, state_for(data, records=records), build_trace(data))
+    loaded, mapped = load_session(path)
+    mapped.close()
+    restored = loaded.records
+    assert restored.column == 'score'
+    assert restored.header == header and restored.records == rows
+    assert list(restored.ranks) == data
+    assert restored.labels == records.labels
+
+
+def test_rejects_position_past_the_trace(tmp_path):
+    data = [2, 1]
+    path = str(tmp_path / 'bad.isvs')
+    save_session(path, state_for(data, trace_pos=1000), build_trace(data))
+    with pytest.raises(ValueError):
+        load_session(path)
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / 'junk.isvs'
+    path.write_bytes(b'not a session' * 20)
+    with pytest.raises(ValueError):
+        load_session(str(path))
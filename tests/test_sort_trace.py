@@ -0,0 +1,67 @@
+import itertools
+import random
+
+import pytest
+
+from sort_trace import (OP_COMPARE, OP_DONE, OP_FOUND, OP_SHIFT, MOVE_OPS,
+                        apply_event, build_trace, count_inversions)
+
+ARRAYS = [[], [4], [1, 2, 3], [3, 2, 1], [5, 2, 9, 1, 7, 3], [2, 2, 1, 1], [7] * 5]
+
+
+def replay(data, trace):
+    data = list(data)
+    for event in trace:
+        apply_event(data, event)
+    return data
+
+
+def brute_inversions(data):
+    return sum(1 for a, b in itertools.combinations(data, 2) if a > b)
+
+
+@pytest.mark.parametrize('variant', ['insertion', 'binary', 'shell'])
+@pytest.mark.parametrize('data', ARRAYS)
+def test_trace_replays_to_sorted(variant, data):
+    trace = build_trace(data, variant)
+    assert replay(data, trace) == sorted(data)
+    assert trace[-1] == (OP_DONE, len(data), 0, 0)
+
+
+@pytest.mark.parametrize('data', ARRAYS)
+def test_insertion_shifts_equal_inversions(data):
+    trace = build_trace(data)
+    shifts = sum(1 for event in trace if event[0] == OP_SHIFT)
+    assert shifts == count_inversions(data) == brute_inversions(data)
+
+
+def test_count_inversions_random():
+    rng = random.Random(3)
+    for size in range(0, 40):
+        data = [rng.randint(0, 10) for _ in range(size)]
+        assert count_inversions(data) == brute_inversions(data)
+
+
+def test_quiet_trace_drops_found_events_only():
+    data = [5, 2, 9, 1, 7, 3]
+    verbose = build_trace(data, verbose=True)
+    quiet = build_trace(data, verbose=False)
+    assert [event for event in verbose if event[0] != OP_FOUND] == quiet
+
+
+def test_binary_compares_less_than_linear_on_reversed_input():
+    data = list(range(64, 0, -1))
+
+    def compares(variant):
+        return sum(1 for event in build_trace(data, variant) if event[0] == OP_COMPARE)
+
+    assert compares('binary') < compares('insertion')
+
+
+def test_apply_event_writes_only_moves():
+    data = [1, 2, 3]
+    for event in build_trace([3, 1, 2]):
+        before = list(data)
+        apply_event(data, event)
+        if event[0] not in MOVE_OPS:
+            assert data == before
@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from sort_trace import HistoryEntry, TraceStep, apply_event, build_trace
+from step_history import StepHistory
+
+
+def entries(data):
+    for number, event in enumerate(build_trace(data, verbose=False)):
+        yield HistoryEntry(TraceStep(event, data[0]), number, 0, number, number // 2)
+
+
+@pytest.fixture
+def data():
+    rng = random.Random(7)
+    return [rng.randint(1, 100) for _ in range(40)]
+
+
+def expected_states(data):
+    state = list(data)
+    states = []
+    for event in build_trace(data, verbose=False):
+        apply_event(state, event)
+        states.append(list(state))
+    return states
+
+
+@pytest.mark.parametrize('max_bytes', [256 * 1024, 0])
+def test_state_at_every_step(data, max_bytes):
+    # max_bytes=0 spills every sealed segment to the temporary file
+    history = StepHistory(data, max_bytes=max_bytes, segment_size=16)
+    for entry in entries(data):
+        history.append(entry)
+    states = expected_states(data)
+    assert len(history) == len(states)
+    for index in range(len(states)):
+        assert history.state_at(index) == states[index]
+    assert history.state_at(-1) == sorted(data)
+    if max_bytes == 0:
+        assert history.memory_bytes() == 0
+
+
+@pytest.mark.parametrize('max_bytes', [256 * 1024, 0])
+def test_pop_walks_back_through_segments(data, max_bytes):
+    history = StepHistory(data, max_bytes=max_bytes, segment_size=16)
+    appended = list(entries(data))
+    for entry in appended:
+        history.append(entry)
+    states = expected_states(data)
+    for index in range(len(appended) - 1, 0, -1):
+        popped = history.pop()
+        assert popped.step.event == appended[index].step.event
+        assert popped.comparisons == appended[index].comparisons
+        assert len(history) == index
+        assert history.state_at(-1) == states[index - 1]
+    # Appending after popping continues from the restored state
+    for entry in appended[1:]:
+        history.append(entry)
+    assert history.state_at(-1) == sorted(data)
+
+
+def test_getitem_and_errors(data):
+    history = StepHistory(data, segment_size=8)
+    appended = list(entries(data))
+    for entry in appended:
+        history.append(entry)
+    assert history[0].step.event == appended[0].step.event
+    assert history[-1].step.event == appended[-1].step.event
+    assert history[20].step_number == 20
+    with pytest.raises(IndexError):
+        history[len(appended)]
+    history.reset([1, 2])
+    assert len(history) == 0
+    with pytest.raises(IndexError):
+        history.pop()
@@ -0,0 +1,85 @@
+import os
+import time
+
+from sort_trace import build_trace
+from trace_cache import CACHE_ENV, TraceCache, cache_dir_from_env, default_cache_dir, trace_bytes, trace_key
+
+
+def arrays(count, size=30):
+    return [[(k * 7 + i * 13) % 97 for i in range(size)] for k in range(count)]
+
+
+def test_key_covers_variant_and_verbosity():
+    data = [3, 1, 2]
+    keys = {trace_key(data), trace_key(data, 'binary'), trace_key(data, verbose=False),
+            trace_key([3, 2, 1])}
+    assert len(keys) == 4
+    assert trace_key(data) == trace_key(tuple(data))
+
+
+def test_get_or_build_hits_and_misses():
+    cache = TraceCache()
+    data = [5, 2, 9, 1]
+    trace = cache.get_or_build(data)
+    assert trace == build_trace(data)
+    assert cache.get_or_build(data) is trace
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_memory_tier_is_bounded_by_estimated_size():
+    data = arrays(10)
+    one = trace_bytes(build_trace(data[0]))
+    cache = TraceCache(max_bytes=3 * one)
+    for array in data:
+        cache.get_or_build(array)
+    assert cache.current_bytes <= cache.max_bytes
+    assert 0 < len(cache) < len(data)
+    # Least recently used entries go first
+    assert trace_key(data[-1]) in cache
+    assert trace_key(data[0]) not in cache
+
+
+def test_trace_larger_than_the_cap_is_not_kept():
+    cache = TraceCache(max_bytes=10)
+    cache.get_or_build([3, 2, 1])
+    assert len(cache) == 0 and cache.current_bytes == 0
+
+
+def test_disk_tier_round_trip(tmp_path):
+    data = [5, 2, 9, 1, 7]
+    TraceCache(cache_dir=str(tmp_path)).get_or_build(data)
+    fresh = TraceCache(cache_dir=str(tmp_path))
+    assert fresh.get(trace_key(data)) == build_trace(data)
+    assert fresh.hits == 1
+
+
+def test_disk_tier_trims_least_recently_used(tmp_path):
+    (tmp_path / 'old.trace').write_bytes(b'pickle from an earlier version')
+    data = arrays(12)
+    cache = TraceCache(cache_dir=str(tmp_path), max_disk_bytes=30000)
+    for index, array in enumerate(data):
+        cache.get_or_build(array)
+        # mtimes order the files for eviction; the newest one is never evicted
+        path = cache._path(trace_key(array))
+        if os.path.exists(path):
+            stamp = time.time() - len(data) + index
+            os.utime(path, (stamp, stamp))
+    files = os.listdir(tmp_path)
+    assert 'old.trace' not in files
+    assert sum(os.path.getsize(tmp_path / name) for name in files) <= 30000
+    assert trace_key(data[-1]) + '.isvt' in files
+    assert trace_key(data[0]) + '.isvt' not in files
+
+
+def test_disk_tier_is_opt_in(monkeypatch, tmp_path):
+    monkeypatch.delenv(CACHE_ENV, raising=False)
+    assert cache_dir_from_env() is None
+    monkeypatch.setenv(CACHE_ENV, '0')
+    assert cache_dir_from_env() is None
+    monkeypatch.setenv(CACHE_ENV, '1')
+    assert cache_dir_from_env() == default_cache_dir()
+    monkeypatch.setenv(CACHE_ENV, str(tmp_path))
+    assert cache_dir_from_env() == str(tmp_path)
+    cache = TraceCache()
+    cache.get_or_build([2, 1])
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,62 @@
+import io
+
+import pytest
+
+from sort_trace import OP_COMPARE, MOVE_OPS, build_trace
+from trace_file import MappedTrace, write_trace
+
+
+@pytest.mark.parametrize('variant', ['insertion', 'binary', 'shell'])
+def test_round_trip(tmp_path, variant):
+    data = [5, -2, 9, 1, 7, 3, 2 ** 40]
+    events = build_trace(data, variant, verbose=False)
+    path = tmp_path / 'run.isvt'
+    assert write_trace(str(path), data, iter(events), variant, verbose=False) == len(events)
+    with MappedTrace(str(path)) as trace:
+        assert trace.variant == variant
+        assert trace.verbose is False
+        assert trace.initial_data == data
+        assert len(trace) == len(events)
+        assert list(trace) == events
+        assert trace[0] == events[0]
+        assert trace[-1] == events[-1]
+        assert trace.comparisons == sum(1 for e in events if e[0] == OP_COMPARE)
+        assert trace.swaps == sum(1 for e in events if e[0] in MOVE_OPS)
+        with pytest.raises(IndexError):
+            trace[len(events)]
+
+
+def test_trace_at_offset(tmp_path):
+    data = [3, 1, 2]
+    events = build_trace(data)
+    path = tmp_path / 'embedded.bin'
+    with open(path, 'wb') as f:
+        f.write(b'prefix!')
+        write_trace(f, data, events)
+    with MappedTrace(str(path), offset=7) as trace:
+        assert list(trace) == events
+
+
+def test_write_to_open_file_keeps_position():
+    f = io.BytesIO()
+    f.write(b'abc')
+    write_trace(f, [2, 1], build_trace([2, 1]))
+    assert f.tell() == len(f.getvalue())
+
+
+def test_rejects_other_files(tmp_path):
+    empty = tmp_path / 'empty.isvt'
+    empty.write_bytes(b'')
+    junk = tmp_path / 'junk.isvt'
+    junk.write_bytes(b'x' * 200)
+    for path in (empty, junk):
+        with pytest.raises(ValueError):
+            MappedTrace(str(path))
+
+
+def test_rejects_truncated_file(tmp_path):
+    path = tmp_path / 'run.isvt'
+    write_trace(str(path), [4, 3, 2, 1], build_trace([4, 3, 2, 1]))
+    path.write_bytes(path.read_bytes()[:-5])
+    with pytest.raises(ValueError):
+        MappedTrace(str(path))
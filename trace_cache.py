@@ -0,0 +1,197 @@
+"""
+Trace cache module for the Insertion Sort Visualizer.
+Keeps recently built sort traces in an LRU bounded by their estimated
+memory use, with an optional on-disk tier so the same array never has to
+be traced twice. The disk tier stores traces in the trace_file format and
+is capped in size, dropping the least recently used files first.
+"""
+
+import os
+import sys
+import hashlib
+from collections import OrderedDict
+from sort_trace import build_trace
+from trace_file import write_trace, MappedTrace
+
+CACHE_ENV = "ISV_TRACE_CACHE"
+CACHE_SUFFIX = '.isvt'
+LEGACY_SUFFIX = '.trace'  # pickles written by earlier versions
+
+# Small ints are shared by the interpreter and cost nothing per event
+_SHARED_INTS = range(-5, 257)
+
+
+# Cache dir
+def default_cache_dir():
+    """
+    Per-user cache directory for traces.
+    """
+    base = (os.environ.get('LOCALAPPDATA')
+            or os.environ.get('XDG_CACHE_HOME')
+            or os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(base, 'insertion-sort-visualizer', 'traces')
+
+
+# Cache dir from env
+def cache_dir_from_env():
+    """
+    The disk tier is opt-in: ISV_TRACE_CACHE names a directory, or 1 for
+    default_cache_dir(). Returns None when it is not set.
+    """
+    value = os.environ.get(CACHE_ENV, "").strip()
+    if not value or value == "0":
+        return None
+    return default_cache_dir() if value == "1" else value
+
+
+# Key
+def trace_key(data, variant='insertion', verbose=True):
+    """
+    Content hash of (input array, algorithm variant, verbosity).
+    """
+    payload = repr((variant, bool(verbose), list(data))).encode('utf-8')
+    return hashlib.sha1(payload).hexdigest()
+
+
+# Size
+def trace_bytes(trace):
+    """
+    Estimated memory of a list of (op, i, j, value) tuples: the list, the
+    tuples and every int that is not a shared small int.
+    """
+    size = sys.getsizeof(trace)
+    getsizeof = sys.getsizeof
+    for event in trace:
+        size += getsizeof(event)
+        for value in event:
+            if value not in _SHARED_INTS:
+                size += getsizeof(value)
+    return size
+
+
+class TraceCache:
+    # Init
+    def __init__(self, max_bytes=16 * 1024 * 1024, cache_dir=None, max_disk_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    # Lookup
+    def get(self, key):
+        """
+        Cached trace for key, or None.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        trace = self._load(key)
+        if trace is not None:
+            self.hits += 1
+            self._remember(key, trace)
+            return trace
+        self.misses += 1
+        return None
+
+    # Store
+    def put(self, key, trace):
+        if not isinstance(trace, list):
+            trace = list(trace)
+        self._remember(key, trace)
+        self._save(key, trace)
+
+    # Get or build
+    def get_or_build(self, data, variant='insertion', verbose=True):
+        """
+        Return the trace for data, building it on a miss.
+        """
+        key = trace_key(data, variant, verbose)
+        trace = self.get(key)
+        if trace is None:
+            trace = build_trace(data, variant, verbose)
+            self.put(key, trace)
+        return trace
+
+    # Clear
+    def clear(self):
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    # Memory tier
+    def _remember(self, key, trace):
+        size = trace_bytes(trace)
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.current_bytes -= old[1]
+        self._entries[key] = (trace, size)
+        self.current_bytes += size
+        while self.current_bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+
+    # Disk tier
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + CACHE_SUFFIX)
+
+    def _load(self, key):
+        if not self.cache_dir:
+            return None
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with MappedTrace(path) as mapped:
+                trace = list(mapped)
+            os.utime(path)  # mark as recently used for eviction
+            return trace
+        except Exception as e:
+            print(f"Error reading cached trace: {str(e)}")
+            return None
+
+    def _save(self, key, trace):
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = self._path(key) + '.tmp'
+            # The key identifies the input, so the array itself is not stored
+            write_trace(tmp_path, [], trace)
+            os.replace(tmp_path, self._path(key))
+            self._trim()
+        except Exception as e:
+            print(f"Error writing cached trace: {str(e)}")
+
+    def _trim(self):
+        """
+        Delete the least recently used files until the tier fits in
+        max_disk_bytes; pickles from earlier versions are always dropped.
+        """
+        files = []
+        total = 0
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(LEGACY_SUFFIX):
+                    os.remove(entry.path)
+                elif entry.name.endswith(CACHE_SUFFIX):
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        files.sort()
+        for _, size, path in files:
+            if total <= self.max_disk_bytes:
+                break
+            os.remove(path)
+            total -= size
@@ -0,0 +1,133 @@
+"""
+Trace file module for the Insertion Sort Visualizer.
+Stores sort traces in a compact binary format that can be memory-mapped
+and replayed without loading the whole trace into memory.
+
+Layout (little-endian):
+    header   magic, version, flags, variant, length, event count,
+             comparisons, swaps
+    array    the initial array, one int64 per element
+    records  one fixed-width (opcode, i, j, value) record per event
+"""
+
+import mmap
+import struct
+from array import array
+from sort_trace import OP_COMPARE, MOVE_OPS
+
+MAGIC = b'ISVT'
+VERSION = 1
+FLAG_VERBOSE = 1
+
+HEADER = struct.Struct('<4sHBx16sIQQQ')
+RECORD = struct.Struct('<BIIq')
+_FLUSH_RECORDS = 65536
+
+
+# Write
+def write_trace(path, initial_data, events, variant='insertion', verbose=True):
+    """
+    Stream events to path, or to an open binary file at its current
+    position; returns the number of events written.
+    """
+    if hasattr(path, 'write'):
+        return _write_trace(path, initial_data, events, variant, verbose)
+    with open(path, 'wb') as f:
+        return _write_trace(f, initial_data, events, variant, verbose)
+
+
+def _write_trace(f, initial_data, events, variant, verbose):
+    initial = array('q', initial_data)
+    count = comparisons = swaps = 0
+    pack = RECORD.pack
+    start = f.tell()
+    f.write(b'\0' * HEADER.size)
+    f.write(initial.tobytes())
+    buffer = bytearray()
+    for event in events:
+        op = event[0]
+        buffer += pack(*event)
+        count += 1
+        if op == OP_COMPARE:
+            comparisons += 1
+        elif op in MOVE_OPS:
+            swaps += 1
+        if count % _FLUSH_RECORDS == 0:
+            f.write(buffer)
+            buffer.clear()
+    f.write(buffer)
+    end = f.tell()
+    f.seek(start)
+    f.write(HEADER.pack(MAGIC, VERSION, FLAG_VERBOSE if verbose else 0,
+                        variant.encode('ascii'), len(initial),
+                        count, comparisons, swaps))
+    f.seek(end)
+    return count
+
+
+class MappedTrace:
+    """
+    Read-only, memory-mapped view of a trace file, or of a trace stored
+    at offset inside a larger file. Behaves like a sequence of
+    (op, i, j, value) tuples.
+    """
+    # Init
+    def __init__(self, path, offset=0):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError("Trace file is empty")
+        if len(self._map) < offset + HEADER.size:
+            self.close()
+            raise ValueError("Not a trace file")
+        (magic, version, flags, variant, length,
+         count, comparisons, swaps) = HEADER.unpack_from(self._map, offset)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError("Not a trace file")
+        self.verbose = bool(flags & FLAG_VERBOSE)
+        self.variant = variant.rstrip(b'\0').decode('ascii')
+        self.comparisons = comparisons
+        self.swaps = swaps
+        self._count = count
+        array_start = offset + HEADER.size
+        self._records_start = array_start + 8 * length
+        if len(self._map) < self._records_start + RECORD.size * count:
+            self.close()
+            raise ValueError("Trace file is truncated")
+        self.initial_data = array('q', self._map[array_start:self._records_start]).tolist()
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("trace index out of range")
+        return RECORD.unpack_from(self._map, self._records_start + index * RECORD.size)
+
+    def __iter__(self):
+        end = self._records_start + self._count * RECORD.size
+        unpack_from = RECORD.unpack_from
+        for offset in range(self._records_start, end, RECORD.size):
+            yield unpack_from(self._map, offset)
+
+    # Close
+    def close(self):
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
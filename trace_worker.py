@@ -0,0 +1,81 @@
+"""
+Trace worker module for the Insertion Sort Visualizer.
+Generates a sort trace on a background thread and hands it to the Tk
+thread in batches through a thread-safe queue.
+"""
+
+import queue
+import threading
+import profiling
+from sort_trace import iter_trace
+
+
+class TraceWorker:
+    # Init
+    def __init__(self, data, variant='insertion', verbose=True, batch_size=2048):
+        self.data = list(data)
+        self.variant = variant
+        self.verbose = verbose
+        self.batch_size = batch_size
+        self.events = []
+        self.finished = False
+        self.error = None
+        self._queue = queue.Queue()
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    # Start
+    def start(self):
+        self._thread.start()
+        return self
+
+    # Cancel
+    def cancel(self):
+        self._cancelled.set()
+
+    # Worker thread
+    def _run(self):
+        profiler = profiling.active()
+        if profiler is None:
+            self._generate()
+            return
+        with profiler.profile_thread(), profiler.spans.span('trace_generation'):
+            self._generate()
+
+    # Generate
+    def _generate(self):
+        batch = []
+        try:
+            for event in iter_trace(self.data, self.variant, self.verbose):
+                if self._cancelled.is_set():
+                    return
+                batch.append(event)
+                if len(batch) >= self.batch_size:
+                    self._queue.put(batch)
+                    batch = []
+            self._queue.put(batch)
+        except Exception as e:
+            self._queue.put(e)
+            return
+        self._queue.put(None)
+
+    # Drain
+    def drain(self, max_batches=16):
+        """
+        Move ready batches into events (Tk thread only).
+        Returns True once the whole trace has arrived.
+        """
+        for _ in range(max_batches):
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self.finished = True
+                break
+            if isinstance(item, Exception):
+                self.error = item
+                self.finished = True
+                break
+            self.events.extend(item)
+        return self.finished